@@ -29,7 +29,7 @@ sys.path.append(str(Path(__file__).parent))
 from lib.highlighting_cleanup import clean_docx_highlighting
 from lib.content_loader import load_file_content, load_questionnaire_from_environment
 from lib.claude_api import call_claude_api
-from lib.config import get_policy_instructions_path
+from lib.config import get_policy_instructions_path, env_flag
 from lib.json_utils import (
     extract_json_from_response, 
     validate_json_content, 
@@ -53,8 +53,7 @@ class PolicyProcessor:
     
     def _determine_skip_api(self) -> bool:
         """Determine if API calls should be skipped."""
-        skip_api_env = os.environ.get('SKIP_API_CALL', '').lower()
-        return self.args.skip_api or skip_api_env in ['true', '1', 'yes', 'on']
+        return self.args.skip_api or env_flag('SKIP_API_CALL')
     
     def _get_api_key(self) -> str:
         """Get the Claude API key from arguments or environment."""
@@ -240,10 +239,10 @@ def validate_arguments(args) -> None:
         sys.exit(1)
 
 
-def main():
+def main(argv=None):
     """Main entry point for the AI policy processor."""
     parser = create_argument_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Create and run the processor
     processor = PolicyProcessor(args)
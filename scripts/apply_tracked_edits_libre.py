@@ -14,6 +14,7 @@ Usage:
 Flags:
   --launch  : try to start a headless LibreOffice listener automatically
               (socket: 127.0.0.1:2002, urp)
+  --no-track: apply plain replacements with python-docx and skip LibreOffice
 
 CSV columns (header optional, but recommended):
   Find,Replace,MatchCase,WholeWord,Wildcards,Description,Rule,Comment,Author
@@ -37,6 +38,7 @@ from document_processing import DocumentProcessor, bool_from_str
 from instruction_parser import EditFileReader, validate_format
 from logo_processing import LogoProcessor
 from comment_utils import CommentManager
+from highlighting_cleanup import apply_untracked_replacements
 
 
 class TrackedChangesProcessor:
@@ -47,15 +49,22 @@ class TrackedChangesProcessor:
     def __init__(self, args):
         """Initialize the processor with command line arguments."""
         self.args = args
-        self.lo_manager = LibreOfficeManager(fast_mode=args.fast)
+        self.lo_manager = LibreOfficeManager(fast_mode=args.fast,
+                                             reuse_listener=args.reuse_listener)
         
         # Validate input files
         DocumentProcessor.validate_input_files(args.in_path, args.csv_path)
         
-        # Convert paths to absolute
-        self.input_path = os.path.abspath(args.in_path)
-        self.output_path = os.path.abspath(args.out_path)
-        self.csv_path = os.path.abspath(args.csv_path)
+        # Convert paths to absolute (same as os.path.abspath, one getcwd call)
+        cwd = os.getcwd()
+        self.input_path = os.path.normpath(os.path.join(cwd, args.in_path))
+        self.output_path = os.path.normpath(os.path.join(cwd, args.out_path))
+        self.csv_path = os.path.normpath(os.path.join(cwd, args.csv_path))
+        
+        # Replace descriptor reused across operations on the loaded document
+        self._replace_descriptor = None
+        self._replace_descriptor_doc = None
+        self._replace_flags = None
     
     def process(self) -> None:
         """Execute the complete tracked changes processing workflow."""
@@ -70,6 +79,11 @@ class TrackedChangesProcessor:
                     cleaned_input_path if cleanup_success else None)
                 return
             
+            # Untracked mode: plain python-docx replacements, no LibreOffice
+            if self.args.no_track:
+                self._apply_untracked(cleaned_input_path if cleanup_success else self.input_path)
+                return
+            
             # Step 2: Setup LibreOffice connection
             self._setup_libreoffice()
             
@@ -98,6 +112,32 @@ class TrackedChangesProcessor:
             if cleanup_success and cleaned_input_path != self.input_path:
                 DocumentProcessor.cleanup_temporary_files(cleaned_input_path)
     
+    def _apply_untracked(self, document_path: str) -> None:
+        """Apply text replacements with python-docx, without tracked changes."""
+        print("⚡ --no-track enabled - applying replacements without LibreOffice")
+        print("ℹ️ Logo and comment-only operations are skipped in this mode")
+        
+        if not validate_format(self.csv_path):
+            raise ValueError(f"File {self.csv_path} is not in valid format")
+        
+        # First operation per target wins and the rest run in CSV order, as in
+        # the tracked path. Logo rows carry an empty replacement and would
+        # delete the placeholder text
+        replacements = {}
+        for row in EditFileReader.read_edits(self.csv_path):
+            if row.get("action") == "replace_with_logo":
+                continue
+            find = (row.get("target_text") or "").strip()
+            if find and find not in replacements:
+                replacements[find] = row.get("replacement") or ""
+        
+        success, message = apply_untracked_replacements(
+            document_path, self.output_path, replacements)
+        if not success:
+            print(f"❌ {message}", file=sys.stderr)
+            sys.exit(1)
+        print(f"✅ {message}")
+    
     def _prepare_document(self) -> tuple:
         """
         Prepare document by removing highlighting.
@@ -179,11 +219,25 @@ class TrackedChangesProcessor:
         if not validate_format(self.csv_path):
             raise ValueError(f"File {self.csv_path} is not in valid format")
         
+        # The first operation for a target already replaces every occurrence,
+        # so repeated targets would only rescan the document
+        seen_targets = set()
+        duplicate_count = 0
+        total_replaced = 0
+        operation_count = 0
+        
+        # Per-operation debug output is skipped in fast mode
+        verbose = not self.args.fast
+        
         for row in EditFileReader.read_edits(self.csv_path):
             find = (row.get("target_text") or "").strip()
             repl = (row.get("replacement") or "")
             if not find:
                 continue
+            if find in seen_targets:
+                duplicate_count += 1
+                continue
+            seen_targets.add(find)
             
             # v5.2 format uses simple replacement - no complex matching options needed
             match_case = True  # Make all text operations case sensitive
@@ -193,10 +247,11 @@ class TrackedChangesProcessor:
             author_name = (row.get("comment_author") or "Secfix AI").strip()
             
             # DEBUG: Show what we extracted from JSON
-            if comment_text:
-                print(f"📝 DEBUG JSON: Found comment for '{find[:30]}...': '{comment_text[:50]}...'")
-            else:
-                print(f"📝 DEBUG JSON: No comment for '{find[:30]}...'")
+            if verbose:
+                if comment_text:
+                    print(f"📝 DEBUG JSON: Found comment for '{find[:30]}...': '{comment_text[:50]}...'")
+                else:
+                    print(f"📝 DEBUG JSON: No comment for '{find[:30]}...'")
             
             # SAFETY: Ensure author is always Secfix AI (override any other values)
             if author_name != "Secfix AI":
@@ -204,13 +259,15 @@ class TrackedChangesProcessor:
                 author_name = "Secfix AI"
             
             # CRITICAL: Set author BEFORE EVERY SINGLE REPLACEMENT
-            print(f"🚨 SETTING AUTHOR TO '{author_name}' BEFORE PROCESSING '{find}'")
+            if verbose:
+                print(f"🚨 SETTING AUTHOR TO '{author_name}' BEFORE PROCESSING '{find}'")
             comment_manager.update_document_author(author_name)
             
             # DOUBLE CHECK: Also set it directly on the document
             try:
                 doc.setPropertyValue("RedlineAuthor", author_name)
-                print(f"✅ Double-confirmed RedlineAuthor = '{author_name}' for this replacement")
+                if verbose:
+                    print(f"✅ Double-confirmed RedlineAuthor = '{author_name}' for this replacement")
             except Exception as e:
                 print(f"❌ Failed double-check: {e}")
             
@@ -218,18 +275,23 @@ class TrackedChangesProcessor:
             replaced_count, prev_redlines_count = self._perform_replacement(
                 doc, find, repl, match_case, whole_word, wildcards)
             
+            operation_count += 1
+            total_replaced += replaced_count
+            
             # DEBUG: Show replacement result  
-            print(f"🔄 DEBUG REPLACEMENT: '{find[:30]}...' -> replaced_count = {replaced_count}")
+            if verbose:
+                print(f"🔄 DEBUG REPLACEMENT: '{find[:30]}...' -> replaced_count = {replaced_count}")
             
             # Add comment if provided and replacements were made
             if comment_text and replaced_count > 0:
-                print(f"💬 DEBUG COMMENT: Attempting to add comment for '{find[:30]}...'")
+                if verbose:
+                    print(f"💬 DEBUG COMMENT: Attempting to add comment for '{find[:30]}...'")
                 comment_manager.add_comment_to_replacements(
                     find, repl, comment_text, author_name, 
                     match_case, whole_word, prev_redlines_count)
-            elif comment_text and replaced_count == 0:
+            elif verbose and comment_text and replaced_count == 0:
                 print(f"❌ DEBUG COMMENT: Skipping comment because replacement failed (count=0) for '{find[:30]}...'")
-            elif not comment_text and replaced_count > 0:
+            elif verbose and not comment_text and replaced_count > 0:
                 print(f"❌ DEBUG COMMENT: Skipping comment because no comment text for '{find[:30]}...'")
             
             # Log results
@@ -240,6 +302,10 @@ class TrackedChangesProcessor:
                     print(f"Replaced {replaced_count} occurrence(s) of '{find}' with '{repl}' by {author_name}")
             else:
                 print(f"❌ No replacements made for '{find}'")
+        
+        if duplicate_count:
+            print(f"♻️ Skipped {duplicate_count} duplicate target_text operation(s)")
+        print(f"📊 Total replacements: {total_replaced} across {operation_count} operation(s)")
     
     def _perform_replacement(self, doc, find: str, repl: str, match_case: bool, 
                            whole_word: bool, wildcards: bool) -> tuple:
@@ -258,18 +324,9 @@ class TrackedChangesProcessor:
         except Exception:
             prev_redlines_count = 0
         
-        # Create replace descriptor
-        rd = doc.createReplaceDescriptor()
+        rd = self._get_replace_descriptor(doc, match_case, whole_word, wildcards)
         rd.SearchString = find
         rd.ReplaceString = repl
-        rd.SearchCaseSensitive = match_case
-        rd.SearchWords = whole_word
-        
-        # Use ICU regex if requested
-        try:
-            rd.setPropertyValue("RegularExpressions", bool(wildcards))
-        except Exception:
-            pass
         
         # Perform the replacement in main document
         count_replaced = doc.replaceAll(rd)
@@ -285,6 +342,34 @@ class TrackedChangesProcessor:
         
         return count_replaced, prev_redlines_count
     
+    def _get_replace_descriptor(self, doc, match_case: bool, whole_word: bool, wildcards: bool):
+        """
+        Return the replace descriptor for this document, creating it once.
+        
+        Every UNO call is a round trip to LibreOffice, so the descriptor is
+        reused across operations and its search flags are only set when they
+        change.
+        """
+        if self._replace_descriptor is None or self._replace_descriptor_doc is not doc:
+            self._replace_descriptor = doc.createReplaceDescriptor()
+            self._replace_descriptor_doc = doc
+            self._replace_flags = None
+        
+        rd = self._replace_descriptor
+        flags = (match_case, whole_word, wildcards)
+        if self._replace_flags != flags:
+            rd.SearchCaseSensitive = match_case
+            rd.SearchWords = whole_word
+            
+            # Use ICU regex if requested
+            try:
+                rd.setPropertyValue("RegularExpressions", bool(wildcards))
+            except Exception:
+                pass
+            self._replace_flags = flags
+        
+        return rd
+    
     def _try_header_footer_replacement(self, doc, find: str, repl: str, match_case: bool, whole_word: bool) -> int:
         """Try replacement in document headers and footers."""
         total_replaced = 0
@@ -514,12 +599,16 @@ def create_argument_parser() -> argparse.ArgumentParser:
                        help="Output .docx (will be overwritten)")
     parser.add_argument("--launch", action="store_true", 
                        help="Launch a headless LibreOffice UNO listener if not already running")
+    parser.add_argument("--reuse-listener", action="store_true", 
+                       help="With --launch, keep an already running listener instead of restarting it")
     parser.add_argument("--logo", dest="logo_path", 
                        help="Optional path to company logo image (png/jpg) to insert in header")
     parser.add_argument("--questionnaire", dest="questionnaire_csv", 
                        help="Optional path to questionnaire CSV for logo URL extraction")
     parser.add_argument("--fast", action="store_true", 
                        help="Enable fast mode: use shorter timeouts, minimal retries, optimized logo downloads")
+    parser.add_argument("--no-track", dest="no_track", action="store_true", 
+                       help="Apply replacements with python-docx only (no tracked changes, no LibreOffice)")
     
     return parser
 
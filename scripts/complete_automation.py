@@ -25,6 +25,7 @@ import sys
 import argparse
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Tuple
 
@@ -35,7 +36,7 @@ sys.path.append(str(Path(__file__).parent))
 from lib import (
     # Command utilities
     generate_user_id, validate_api_key, setup_file_paths, show_startup_info,
-    run_command, convert_xlsx_to_csv, generate_edits_with_ai,
+    convert_xlsx_to_csv, generate_edits_with_ai, preload_ai_processor,
     # Git utilities
     commit_and_push_files, cleanup_user_git_operations,
     # GitHub utilities  
@@ -43,6 +44,7 @@ from lib import (
     # Logo utilities
     process_logo_operations, inject_logo_metadata, cleanup_logo_file
 )
+from lib.config import env_flag
 
 
 class AutomationOrchestrator:
@@ -68,8 +70,7 @@ class AutomationOrchestrator:
     
     def _should_skip_api(self) -> bool:
         """Determine if API calls should be skipped."""
-        skip_api_env = os.environ.get('SKIP_API_CALL', '').lower()
-        return self.args.skip_api or skip_api_env in ['true', '1', 'yes', 'on']
+        return self.args.skip_api or env_flag('SKIP_API_CALL')
     
     def process_questionnaire_input(self) -> Tuple[Optional[str], Optional[str]]:
         """
@@ -111,7 +112,12 @@ class AutomationOrchestrator:
             
         elif questionnaire.endswith(('.xlsx', '.xls')):
             print("\n📊 STEP 1: Converting Excel to CSV")
-            success, output = convert_xlsx_to_csv(questionnaire, self.file_paths['questionnaire_csv'])
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                conversion = executor.submit(
+                    convert_xlsx_to_csv, questionnaire, self.file_paths['questionnaire_csv'])
+                # Warm up the AI step imports while the workbook converts
+                preload_ai_processor(self._should_skip_api())
+                success, output = conversion.result()
             if not success:
                 print(f"❌ Excel conversion failed: {output}")
                 sys.exit(1)
@@ -148,7 +154,8 @@ class AutomationOrchestrator:
             self.file_paths['edits_json'], 
             self.api_key, 
             skip_api, 
-            questionnaire_json
+            questionnaire_json,
+            use_cache=not (self.args.no_ai_cache or env_flag('NO_AI_CACHE'))
         )
         
         if not success:
@@ -256,7 +263,7 @@ class AutomationOrchestrator:
     
     def _should_stop_after_json(self) -> bool:
         """Check if automation should stop after generating JSON edits."""
-        return os.getenv('STOP_AFTER_JSON', '').lower() in ('true', '1', 'yes', 'on')
+        return env_flag('STOP_AFTER_JSON')
     
     def _show_json_only_completion(self) -> None:
         """Show completion message when stopping after JSON generation only."""
@@ -372,6 +379,8 @@ def create_argument_parser() -> argparse.ArgumentParser:
                        help='Skip GitHub Actions step')
     parser.add_argument('--skip-api', action='store_true', 
                        help='Skip API call and use existing JSON file (for testing/development)')
+    parser.add_argument('--no-ai-cache', action='store_true',
+                       help='Always call the API, even when the inputs match the last run (or set NO_AI_CACHE=true)')
     
     # Optional features
     parser.add_argument('--logo', 
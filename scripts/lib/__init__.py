@@ -17,20 +17,21 @@ __version__ = "1.0.0"
 __author__ = "Policy Automation Team"
 
 # Import commonly used functions for easier access
-from .highlighting_cleanup import clean_docx_highlighting, extract_docx_content
+from .highlighting_cleanup import clean_docx_highlighting, extract_docx_content, apply_untracked_replacements
 from .content_loader import load_file_content, filter_base64_from_csv  
 from .claude_api import call_claude_api
 from .json_utils import extract_json_from_response, validate_json_content
 from .git_utils import commit_and_push_files, GitManager, cleanup_user_git_operations
 from .github_utils import GitHubActionsManager, create_workflow_params, clean_policy_for_github, cleanup_temp_files
 from .logo_utils import process_logo_operations, inject_logo_metadata, cleanup_logo_file
-from .shell_executor import run_command, generate_user_id, validate_api_key, setup_file_paths, show_startup_info, convert_xlsx_to_csv, generate_edits_with_ai
+from .shell_executor import generate_user_id, validate_api_key, setup_file_paths, show_startup_info, convert_xlsx_to_csv, generate_edits_with_ai, preload_ai_processor
 
 # Define what gets imported with "from lib import *"
 __all__ = [
     # DOCX utilities
     'clean_docx_highlighting',
     'extract_docx_content', 
+    'apply_untracked_replacements',
     # File utilities
     'load_file_content',
     'filter_base64_from_csv',
@@ -52,11 +53,11 @@ __all__ = [
     'inject_logo_metadata',
     'cleanup_logo_file',
     # Command utilities
-    'run_command',
     'generate_user_id',
     'validate_api_key',
     'setup_file_paths',
     'show_startup_info',
     'convert_xlsx_to_csv',
-    'generate_edits_with_ai'
+    'generate_edits_with_ai',
+    'preload_ai_processor'
 ]
\ No newline at end of file
@@ -8,6 +8,7 @@ This module handles all interactions with the Claude AI API:
 """
 
 import warnings
+from functools import lru_cache
 from typing import Optional
 
 # Import anthropic only when needed (not when skipping API)
@@ -16,6 +17,46 @@ anthropic = None
 # Suppress deprecation warnings for the Claude API
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
+# Model used for edit generation (also part of the edits cache signature)
+CLAUDE_MODEL = "claude-sonnet-4-20250514"
+
+
+def load_anthropic():
+    """
+    Import the anthropic package on first use and cache it at module level.
+    
+    Returns:
+        The anthropic module
+        
+    Raises:
+        ImportError: If anthropic package is not available
+    """
+    global anthropic
+    if anthropic is None:
+        try:
+            import anthropic as anthropic_module
+        except ImportError:
+            raise ImportError("anthropic package is required for API calls. Install it with: pip install anthropic")
+        anthropic = anthropic_module
+    return anthropic
+
+
+@lru_cache(maxsize=4)
+def _get_client(api_key: str):
+    """
+    Return a shared Anthropic client for the given API key.
+    
+    Reusing the client keeps its HTTP connection pool alive, so repeated
+    calls in the same process skip the TCP and TLS handshake.
+    
+    Args:
+        api_key: Claude API key
+        
+    Returns:
+        Anthropic client instance
+    """
+    return load_anthropic().Anthropic(api_key=api_key)
+
 
 def call_claude_api(prompt_content: str, questionnaire_content: str, 
                    policy_instructions_content: str, policy_content: str, 
@@ -38,14 +79,7 @@ def call_claude_api(prompt_content: str, questionnaire_content: str,
         Exception: If API call fails
     """
     # Import anthropic here when actually needed
-    global anthropic
-    if anthropic is None:
-        try:
-            import anthropic
-        except ImportError:
-            raise ImportError("anthropic package is required for API calls. Install it with: pip install anthropic")
-    
-    client = anthropic.Anthropic(api_key=api_key)
+    client = _get_client(api_key)
     
     # Construct the full prompt with the new JSON workflow
     # Note: Sending full document content for better AI context and grammar decisions
@@ -59,7 +93,7 @@ def call_claude_api(prompt_content: str, questionnaire_content: str,
 
     try:
         message = client.messages.create(
-            model="claude-sonnet-4-20250514",  # Claude Sonnet model
+            model=CLAUDE_MODEL,
             max_tokens=12000,
             temperature=0.0,  # Zero temperature for maximum consistency and deterministic output
             messages=[{
@@ -447,13 +447,16 @@ class CommentManager:
             
             # Try to write to a lost comments file
             try:
+                entry = "".join([
+                    f"\n{timestamp} - LOST COMMENT:\n",
+                    f"  Find: {find_text}\n",
+                    f"  Replace: {replace_text}\n",
+                    f"  Comment: {comment_text}\n",
+                    f"  Author: {author_name}\n",
+                    "-" * 50 + "\n",
+                ])
                 with open("lost_comments.txt", "a", encoding='utf-8') as f:
-                    f.write(f"\n{timestamp} - LOST COMMENT:\n")
-                    f.write(f"  Find: {find_text}\n")
-                    f.write(f"  Replace: {replace_text}\n") 
-                    f.write(f"  Comment: {comment_text}\n")
-                    f.write(f"  Author: {author_name}\n")
-                    f.write("-" * 50 + "\n")
+                    f.write(entry)
                 print(f"📝 Logged lost comment to lost_comments.txt")
             except:
                 # If file write fails, at least print it clearly
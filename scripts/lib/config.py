@@ -87,6 +87,16 @@ def get_config() -> Config:
     return _config
 
 
+# Values accepted as "enabled" for boolean environment flags
+TRUTHY_VALUES = frozenset({'true', '1', 'yes', 'on'})
+
+
+def env_flag(name: str) -> bool:
+    """Return whether a boolean environment flag such as SKIP_API_CALL is enabled"""
+    value = os.environ.get(name)
+    return value is not None and value.casefold() in TRUTHY_VALUES
+
+
 def get_policy_instructions_path() -> str:
     """Convenience function to get policy instructions path"""
     return get_config().policy_instructions_path
@@ -79,8 +79,8 @@ class DocumentProcessor:
             
             from ai_policy_processor import clean_docx_highlighting
             
-            # Clean highlighting from the working copy
-            success, message = clean_docx_highlighting(file_path)
+            # Clean highlighting from the working copy (temporary, so save fast)
+            success, message = clean_docx_highlighting(file_path, fast_save=True)
             
             if success:
                 print(f"✅ Highlighting removal: {message}")
@@ -147,10 +147,11 @@ class DocumentProcessor:
         Raises:
             SystemExit: If files don't exist
         """
-        if not os.path.exists(input_path):
+        # os.access(F_OK) is a single access() syscall, cheaper than a full stat
+        if not os.access(input_path, os.F_OK):
             print("Input DOCX not found:", input_path, file=sys.stderr)
             sys.exit(2)
-        if not os.path.exists(csv_path):
+        if not os.access(csv_path, os.F_OK):
             print("CSV/JSON not found:", csv_path, file=sys.stderr)
             sys.exit(2)
     
@@ -198,7 +199,7 @@ class DocumentProcessor:
             shutil.copy2(output_path, test_path)
             
             # Try to clean highlighting from the test copy
-            success, message = clean_docx_highlighting(test_path)
+            success, message = clean_docx_highlighting(test_path, fast_save=True)
             
             if "Removed highlighting from" in message:
                 highlighting_count = message.split("Removed highlighting from ")[1].split(" text runs")[0]
@@ -9,10 +9,46 @@ This module handles all Git operations for the automation system:
 """
 
 import os
+import re
 import subprocess
 import time
+from functools import lru_cache
 from typing import List, Optional, Tuple
 
+# owner/repo from HTTPS or SSH remotes; repo names may contain dots
+_GITHUB_URL_RE = re.compile(r'github\.com[:/]([^/]+)/([^/]+?)(?:\.git)?/?$')
+
+
+@lru_cache(maxsize=None)
+def get_origin_url(repo_path: str = ".") -> Optional[str]:
+    """
+    Look up the 'origin' remote URL once per repository path.
+    
+    GitManager is instantiated several times per run (commit, cleanup),
+    so the 'git remote get-url' probe is cached instead of re-spawned.
+    
+    Args:
+        repo_path: Path to repository
+        
+    Returns:
+        Remote URL, or None if it could not be determined
+    """
+    try:
+        result = subprocess.run(
+            ['git', 'remote', 'get-url', 'origin'],
+            capture_output=True,
+            text=True,
+            cwd=repo_path,
+            timeout=5
+        )
+    except Exception:
+        # Git command failed or not available
+        return None
+    
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip()
+
 
 class GitManager:
     """
@@ -53,23 +89,13 @@ class GitManager:
     def _extract_repo_from_git(self) -> None:
         """Extract repository information from git remote URL."""
         try:
-            result = subprocess.run(
-                ['git', 'remote', 'get-url', 'origin'],
-                capture_output=True,
-                text=True,
-                cwd=self.repo_path,
-                timeout=5
-            )
-            
-            if result.returncode == 0:
-                url = result.stdout.strip()
-                if 'github.com' in url:
-                    # Parse GitHub URL (both HTTPS and SSH formats)
-                    import re
-                    match = re.search(r'github\.com[:/]([^/]+)/([^/\.]+)', url)
-                    if match:
-                        self.repo_owner = match.group(1)
-                        self.repo_name = match.group(2)
+            url = get_origin_url(self.repo_path)
+            if url and 'github.com' in url:
+                # Parse GitHub URL (both HTTPS and SSH formats)
+                match = _GITHUB_URL_RE.search(url)
+                if match:
+                    self.repo_owner = match.group(1)
+                    self.repo_name = match.group(2)
         except Exception:
             # Git command failed or not available - use environment variables only
             pass
@@ -81,17 +107,19 @@ class GitManager:
         print(f"   Working Directory: {os.getcwd()}")
         print(f"   Repository Path: {self.repo_path}")
         
-        # Check if we're in the right directory
+        # Check if we're in the right directory - one directory scan instead of a stat per entry
+        with os.scandir('.') as entries:
+            present = {entry.name for entry in entries}
         expected_files = ['data', 'edits', 'scripts', '.git']
-        missing_dirs = [d for d in expected_files if not os.path.exists(d)]
+        missing_dirs = [d for d in expected_files if d not in present]
         if missing_dirs:
             print(f"⚠️  Missing expected directories: {missing_dirs}")
-            print(f"📁 Current directory contents: {os.listdir('.')}")
+            print(f"📁 Current directory contents: {sorted(present)}")
         else:
             print(f"✅ All expected directories present")
         
         # Ensure we have a git repository
-        if not os.path.exists('.git'):
+        if '.git' not in present:
             return False, "No git repository found - .git directory missing"
         
         return True, "Repository validation successful"
@@ -220,8 +248,9 @@ class GitManager:
     def ensure_proper_branch(self) -> Tuple[bool, str]:
         """Ensure we're on a proper branch (not detached HEAD)."""
         print("🔍 Checking repository state before committing...")
-        status_check = subprocess.run(['git', 'status'], capture_output=True, text=True)
-        if status_check.returncode == 0 and "HEAD detached" in status_check.stdout:
+        # 'git symbolic-ref' only reads HEAD, unlike 'git status' which walks the whole tree
+        head_check = subprocess.run(['git', 'symbolic-ref', '-q', 'HEAD'], capture_output=True, text=True)
+        if head_check.returncode == 1:
             print("🚨 Repository is in detached HEAD state - fixing before commit...")
             
             # Check for untracked files that might conflict with checkout
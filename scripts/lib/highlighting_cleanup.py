@@ -5,29 +5,37 @@ This module provides utilities for working with DOCX documents:
 - Removing highlighting from documents
 - Extracting clean text content
 - Processing headers, footers, and tables
+- Applying plain find/replace edits without tracked changes
 """
 
+import re
 import warnings
-from typing import Tuple, Optional
+import zipfile
+from typing import Dict, Tuple, Optional
 
 # Suppress docx warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
+# Deflate level for throwaway working copies saved with fast_save (1 = fastest)
+DOCX_FAST_COMPRESSLEVEL = 1
 
-def clean_docx_highlighting(input_path: str, output_path: Optional[str] = None) -> Tuple[bool, str]:
+
+def clean_docx_highlighting(input_path: str, output_path: Optional[str] = None,
+                            fast_save: bool = False) -> Tuple[bool, str]:
     """
     Remove all highlighting from a DOCX file.
     
     Args:
         input_path: Path to input DOCX file
         output_path: Path for output (defaults to overwriting input)
+        fast_save: Deflate at DOCX_FAST_COMPRESSLEVEL; only for temporary
+            working copies, as the file comes out considerably larger
         
     Returns:
         Tuple of (success: bool, message: str)
     """
     try:
         import docx
-        from docx.shared import RGBColor
         
         # If no output path specified, overwrite the input file
         if output_path is None:
@@ -49,7 +57,10 @@ def clean_docx_highlighting(input_path: str, output_path: Optional[str] = None)
             highlighting_removed += _clean_section_highlighting(section)
         
         # Save the cleaned document
-        doc.save(output_path)
+        if fast_save:
+            _save_docx_fast(doc, output_path)
+        else:
+            doc.save(output_path)
         
         if highlighting_removed > 0:
             print(f"🎨 Removed highlighting from {highlighting_removed} text runs in DOCX")
@@ -62,6 +73,123 @@ def clean_docx_highlighting(input_path: str, output_path: Optional[str] = None)
         return False, f"Error cleaning DOCX highlighting: {e}"
 
 
+def apply_untracked_replacements(input_path: str, output_path: str,
+                                 replacements: Dict[str, str]) -> Tuple[bool, str]:
+    """
+    Apply find/replace edits directly with python-docx, without tracked changes.
+    
+    Replacements are applied one after another in mapping order, each to
+    every paragraph, mirroring the sequential replaceAll of the tracked
+    path, so no LibreOffice instance is needed.
+    
+    Args:
+        input_path: Path to input DOCX file
+        output_path: Path for the edited DOCX file
+        replacements: Mapping of find text to replacement text
+        
+    Returns:
+        Tuple of (success: bool, message: str)
+    """
+    if not replacements:
+        return False, "No replacements to apply"
+    
+    try:
+        import docx
+        
+        counts = {}
+        
+        doc = docx.Document(input_path)
+        paragraphs = list(_iter_all_paragraphs(doc))
+        for find, replacement in replacements.items():
+            pattern = re.compile(re.escape(find))
+            
+            def substitute(match, find=find, replacement=replacement):
+                counts[find] = counts.get(find, 0) + 1
+                return replacement
+            
+            for paragraph in paragraphs:
+                _replace_in_paragraph(paragraph, pattern, substitute)
+        
+        doc.save(output_path)
+        
+        total_replaced = sum(counts.values())
+        missing = [find for find in replacements if find not in counts]
+        for find in missing:
+            print(f"❌ No replacements made for '{find}'")
+        print(f"📊 Total replacements: {total_replaced} across {len(replacements)} operation(s)")
+        
+        return True, f"Applied {total_replaced} untracked replacements"
+        
+    except ImportError:
+        return False, "python-docx not available for untracked replacements"
+    except Exception as e:
+        return False, f"Error applying untracked replacements: {e}"
+
+
+def _iter_all_paragraphs(doc):
+    """Yield every paragraph in the body, tables, headers and footers."""
+    def from_container(container):
+        for paragraph in container.paragraphs:
+            yield paragraph
+        for table in container.tables:
+            # row.cells repeats a merged cell once per grid column it spans
+            seen_cells = set()
+            for row in table.rows:
+                for cell in row.cells:
+                    if cell._tc in seen_cells:
+                        continue
+                    seen_cells.add(cell._tc)
+                    yield from from_container(cell)
+    
+    yield from from_container(doc)
+    for section in doc.sections:
+        for part_name in ['first_page_header', 'even_page_header', 'header',
+                          'first_page_footer', 'even_page_footer', 'footer']:
+            try:
+                part = getattr(section, part_name)
+                if part is not None and not part.is_linked_to_previous:
+                    yield from from_container(part)
+            except Exception:
+                pass
+
+
+def _replace_in_paragraph(paragraph, pattern, substitute) -> None:
+    """Replace matches in a paragraph, keeping run formatting where possible."""
+    text = paragraph.text
+    matches = list(pattern.finditer(text))
+    if not matches:
+        return
+    
+    runs = paragraph.runs
+    run_ends = []
+    offset = 0
+    for run in runs:
+        offset += len(run.text)
+        run_ends.append(offset)
+    
+    # Text outside plain runs (e.g. hyperlinks) cannot be mapped back to runs
+    if not runs or offset != len(text):
+        return
+    
+    # Only fall back to rewriting the whole paragraph when a match spans runs
+    spans_runs = False
+    for match in matches:
+        start_run = next(i for i, end in enumerate(run_ends) if match.start() < end)
+        if match.end() > run_ends[start_run]:
+            spans_runs = True
+            break
+    
+    if spans_runs:
+        # The joined text takes the formatting of the first run
+        runs[0].text = pattern.sub(substitute, text)
+        for run in runs[1:]:
+            run.text = ""
+    else:
+        for run in runs:
+            if run.text:
+                run.text = pattern.sub(substitute, run.text)
+
+
 def extract_docx_content(file_path: str, filter_highlighted: bool = True) -> str:
     """
     Extract text content from a DOCX file.
@@ -106,6 +234,46 @@ def extract_docx_content(file_path: str, filter_highlighted: bool = True) -> str
         raise Exception(f"Error reading DOCX file {file_path}: {e}")
 
 
+class _FastZipPkgWriter:
+    """Write OPC package members to a zip deflated at DOCX_FAST_COMPRESSLEVEL."""
+    
+    def __init__(self, pkg_file: str):
+        self._zipf = zipfile.ZipFile(pkg_file, "w", compression=zipfile.ZIP_DEFLATED,
+                                     compresslevel=DOCX_FAST_COMPRESSLEVEL)
+    
+    def write(self, pack_uri, blob) -> None:
+        self._zipf.writestr(pack_uri.membername, blob)
+    
+    def close(self) -> None:
+        self._zipf.close()
+
+
+def _save_docx_fast(doc, output_path: str) -> None:
+    """
+    Save a python-docx Document deflated at DOCX_FAST_COMPRESSLEVEL.
+    
+    Mirrors OpcPackage.save with its own zip writer, so nothing in python-docx
+    is patched and concurrent saves are unaffected. Falls back to doc.save()
+    if the package writer helpers are unavailable.
+    """
+    try:
+        from docx.opc.pkgwriter import PackageWriter
+        package = doc.part.package
+        parts = list(package.parts)
+        for part in parts:
+            part.before_marshal()
+        
+        writer = _FastZipPkgWriter(output_path)
+        try:
+            PackageWriter._write_content_types_stream(writer, parts)
+            PackageWriter._write_pkg_rels(writer, package.rels)
+            PackageWriter._write_parts(writer, parts)
+        finally:
+            writer.close()
+    except (ImportError, AttributeError):
+        doc.save(output_path)
+
+
 def _clean_paragraph_highlighting(paragraph) -> int:
     """Clean highlighting from a single paragraph."""
     highlighting_removed = 0
@@ -8,10 +8,35 @@ No grammar analyzer needed - just apply the AI decisions directly.
 """
 
 import json
+import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Iterator, Dict, Any
 
 
+@lru_cache(maxsize=8)
+def _parse_edit_file(file_path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse an edits JSON file; cached per (path, modification time)."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_edit_file(file_path: str) -> Dict[str, Any]:
+    """
+    Load an edits JSON file, parsing it only once per process.
+    
+    The logo, comment and replacement passes all read the same file, so the
+    parsed document is shared between them. Callers must not mutate it.
+    
+    Args:
+        file_path: Path to the JSON file
+        
+    Returns:
+        Parsed JSON data
+    """
+    return _parse_edit_file(file_path, os.stat(file_path).st_mtime_ns)
+
+
 class EditFileReader:
     """
     Simplified reader for JSON operations.
@@ -33,8 +58,7 @@ class EditFileReader:
         Yields:
             Dictionary containing edit instructions ready for direct application
         """
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_edit_file(file_path)
         
         operations = data.get('instructions', {}).get('operations', [])
         
@@ -88,8 +112,7 @@ class EditFileReader:
         Returns:
             Dictionary containing metadata
         """
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_edit_file(file_path)
         
         return data.get('metadata', {})
     
@@ -104,8 +127,7 @@ class EditFileReader:
         Yields:
             Dictionary containing comment-only operations
         """
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_edit_file(file_path)
         
         operations = data.get('instructions', {}).get('operations', [])
         
@@ -130,8 +152,7 @@ def validate_format(file_path: str) -> bool:
         True if valid format, False otherwise
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_edit_file(file_path)
         
         # Check required structure
         if 'metadata' not in data:
@@ -10,18 +10,26 @@ import sys
 import time
 import subprocess
 import socket
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Tuple, Any
 
+# UNO listener port used by the headless LibreOffice instance
+UNO_PORT = 2002
+
+# Seconds between readiness checks while waiting on the listener port
+LISTENER_POLL_INTERVAL = 0.05
+
 
 class LibreOfficeManager:
     """
     Manages LibreOffice headless operations and document manipulation.
     """
     
-    def __init__(self, fast_mode: bool = False):
+    def __init__(self, fast_mode: bool = False, reuse_listener: bool = False):
         """Initialize LibreOffice manager."""
         self.fast_mode = fast_mode
+        self.reuse_listener = reuse_listener
         self.ctx = None
         self.desktop = None
         self.smgr = None
@@ -29,12 +37,19 @@ class LibreOfficeManager:
     def ensure_listener(self) -> None:
         """
         Start a headless LibreOffice UNO listener on port 2002 if not already running.
+        
+        When reuse_listener is set and a listener already accepts connections,
+        it is kept instead of being killed and cold-started again.
         """
+        if self.reuse_listener and self._listener_ready():
+            print("♻️ Reusing running LibreOffice listener")
+            return
+        
         try:
             # Kill any existing LibreOffice processes to ensure clean start
             subprocess.run(["pkill", "-f", "soffice"], capture_output=True, 
                          timeout=2 if self.fast_mode else 5)
-            time.sleep(0.5 if self.fast_mode else 1)
+            self._wait_for_port_release(0.5 if self.fast_mode else 1)
             
             # Create a temporary user profile with correct author info
             profile_dir = "/tmp/lo_profile_secfix"
@@ -91,29 +106,45 @@ class LibreOfficeManager:
             "--norestore",
             "--invisible",
             f"-env:UserInstallation=file://{profile_dir}",
-            '--accept=socket,host=127.0.0.1,port=2002;urp;StarOffice.ServiceManager'
+            f'--accept=socket,host=127.0.0.1,port={UNO_PORT};urp;StarOffice.ServiceManager'
         ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=os.environ)
     
+    def _listener_ready(self) -> bool:
+        """Check whether the UNO listener port accepts connections."""
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                sock.settimeout(0.5)
+                return sock.connect_ex(('127.0.0.1', UNO_PORT)) == 0
+        except OSError:
+            return False
+    
+    def _wait_for_port_release(self, max_wait: float) -> None:
+        """Wait until a killed listener has released the UNO port."""
+        deadline = time.monotonic() + max_wait
+        while time.monotonic() < deadline and self._listener_ready():
+            time.sleep(LISTENER_POLL_INTERVAL)
+    
     def _wait_for_connection(self) -> None:
         """Wait for LibreOffice listener to become available."""
-        max_wait = 5 if self.fast_mode else 15
-        wait_interval = 0.2 if self.fast_mode else 0.5
+        max_wait = 1.0 if self.fast_mode else 7.5
+        log_interval = 1.0
         print("Starting LibreOffice listener...")
         
-        for i in range(max_wait):
-            time.sleep(wait_interval)
-            try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(0.5)
-                result = sock.connect_ex(('127.0.0.1', 2002))
-                sock.close()
-                if result == 0:
-                    print(f"LibreOffice listener ready after {(i+1)*wait_interval:.1f} seconds")
-                    return
-            except:
-                pass
-            if not self.fast_mode or i % 5 == 0:  # Reduce log spam in fast mode
-                print(f"Waiting for LibreOffice... ({i+1}/{max_wait})")
+        start = time.monotonic()
+        next_log = start + log_interval
+        while True:
+            # Poll the port instead of sleeping a fixed interval before each check
+            if self._listener_ready():
+                print(f"LibreOffice listener ready after {time.monotonic() - start:.1f} seconds")
+                return
+            
+            now = time.monotonic()
+            if now - start >= max_wait:
+                break
+            if now >= next_log:
+                print(f"Waiting for LibreOffice... ({now - start:.1f}s/{max_wait:.1f}s)")
+                next_log = now + log_interval
+            time.sleep(LISTENER_POLL_INTERVAL)
         
         print("WARNING: LibreOffice listener may not be ready")
     
@@ -137,7 +168,7 @@ class LibreOfficeManager:
             for attempt in range(max_attempts):
                 try:
                     self.ctx = resolver.resolve(
-                        "uno:socket,host=127.0.0.1,port=2002;urp;StarOffice.ComponentContext")
+                        f"uno:socket,host=127.0.0.1,port={UNO_PORT};urp;StarOffice.ComponentContext")
                     print(f"✅ Connected to LibreOffice (attempt {attempt + 1})")
                     break
                 except Exception as e:
@@ -382,9 +413,18 @@ def to_url(path: str) -> str:
     Returns:
         URL string
     """
+    if os.path.isabs(path):
+        return _absolute_path_to_url(path)
+    # Relative paths depend on the current directory, so they are not cached
     return Path(path).absolute().as_uri()
 
 
+@lru_cache(maxsize=64)
+def _absolute_path_to_url(path: str) -> str:
+    """Convert an absolute file path to a file:// URL, memoized per path."""
+    return Path(path).as_uri()
+
+
 def get_redline_type(redline: Any) -> str:
     """
     Detect a redline's type ("insert" or "delete").
@@ -778,8 +778,10 @@ class LogoProcessor:
                 import subprocess
                 import sys
                 try:
-                    subprocess.check_call([sys.executable, "-m", "pip", "install", "Pillow"], 
-                                        capture_output=True, timeout=30)
+                    # Merge stderr into stdout so only one pipe is drained
+                    subprocess.run([sys.executable, "-m", "pip", "install", "Pillow"], 
+                                   stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   timeout=30, check=True)
                     from PIL import Image
                     print("📏 Successfully installed and imported Pillow")
                 except Exception as install_error:
@@ -1,65 +1,94 @@
 """
 Shell Command Execution Utilities
 
-This module provides utilities for running shell commands and subprocess operations:
-- Command execution with proper error handling
-- Real-time output for specific command types
+This module provides utilities for running the automation steps:
+- In-process execution of sibling scripts with proper error handling
 - Environment setup and validation
 - User ID generation for multi-user isolation
 """
 
 import os
 import sys
-import subprocess
 import time
 import random
-from typing import Tuple, Optional
+import importlib
+import hashlib
+from typing import Callable, List, Tuple, Optional
 from pathlib import Path
 from .config import get_policy_instructions_path
+from . import claude_api
 
 
-def run_command(cmd: str, description: str) -> Tuple[bool, str]:
+def _import_script(module_name: str):
     """
-    Run a shell command and handle errors.
+    Import one of the sibling scripts (e.g. ai_policy_processor) as a module.
     
     Args:
-        cmd: Command to execute
-        description: Human-readable description of the command
+        module_name: Module name of the script inside the scripts directory
+        
+    Returns:
+        The imported module
+    """
+    script_dir = str(Path(__file__).parent.parent)
+    if script_dir not in sys.path:
+        sys.path.append(script_dir)
+    return importlib.import_module(module_name)
+
+
+def run_script_main(main_func: Callable[[List[str]], None], argv: List[str],
+                    description: str) -> Tuple[bool, str]:
+    """
+    Run a script's main() in-process instead of spawning a new interpreter.
+    
+    Avoids the interpreter startup and re-import of heavy dependencies
+    (openpyxl, anthropic, python-docx) that a subprocess would pay each time.
+    
+    Args:
+        main_func: Script entry point accepting an argv list
+        argv: Command line arguments for the script
+        description: Human-readable description of the step
         
     Returns:
         Tuple of (success: bool, output_or_error: str)
     """
     print(f"🔄 {description}...")
     
-    # For AI processing commands, show real-time output to see base64 filtering logs
-    if 'ai_policy_processor.py' in cmd:
-        try:
-            # Use real-time output for AI processing to show filtering logs
-            result = subprocess.run(cmd, shell=True, text=True)
-            if result.returncode != 0:
-                print(f"❌ {description} failed with exit code {result.returncode}!")
-                print(f"Command was: {cmd}")
-                return False, f"Command failed with exit code {result.returncode}"
-            print(f"✅ {description} completed")
-            return True, ""
-        except Exception as e:
-            print(f"❌ {description} failed with exception: {e}")
-            return False, str(e)
-    else:
-        # Use captured output for other commands
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            print(f"❌ {description} failed!")
-            error_msg = result.stderr.strip() if result.stderr.strip() else result.stdout.strip()
-            if not error_msg:
-                error_msg = f"Command failed with exit code {result.returncode} but no error message"
-            print(f"Error: {error_msg}")
-            print(f"Command was: {cmd}")
-            return False, error_msg
+    try:
+        main_func(argv)
+    except SystemExit as e:
+        # Scripts report failure via sys.exit - keep those semantics
+        if e.code not in (None, 0):
+            print(f"❌ {description} failed with exit code {e.code}!")
+            return False, f"Command failed with exit code {e.code}"
+    except Exception as e:
+        print(f"❌ {description} failed with exception: {e}")
+        return False, str(e)
+    
+    print(f"✅ {description} completed")
+    return True, ""
+
+
+def _run_script(module_name: str, argv: List[str], description: str) -> Tuple[bool, str]:
+    """
+    Import a sibling script and run its main() in-process.
+    
+    A failing import (e.g. a missing dependency) is reported like any other
+    step failure instead of raising.
+    
+    Args:
+        module_name: Module name of the script inside the scripts directory
+        argv: Command line arguments for the script
+        description: Human-readable description of the step
         
-        print(f"✅ {description} completed")
-        return True, result.stdout
+    Returns:
+        Tuple of (success: bool, output_or_error: str)
+    """
+    try:
+        module = _import_script(module_name)
+    except Exception as e:
+        print(f"❌ {description} failed - could not import {module_name}: {e}")
+        return False, str(e)
+    return run_script_main(module.main, argv, description)
 
 
 def convert_xlsx_to_csv(xlsx_path: str, csv_path: str) -> Tuple[bool, str]:
@@ -73,14 +102,66 @@ def convert_xlsx_to_csv(xlsx_path: str, csv_path: str) -> Tuple[bool, str]:
     Returns:
         Tuple of (success: bool, output_or_error: str)
     """
-    cmd = f"python3 scripts/xlsx_to_csv_converter.py '{xlsx_path}' '{csv_path}'"
-    return run_command(cmd, "Converting Excel to CSV")
+    return _run_script('xlsx_to_csv_converter', [xlsx_path, csv_path], "Converting Excel to CSV")
+
+
+def preload_ai_processor(skip_api: bool = False) -> None:
+    """
+    Import the AI processor (and the anthropic SDK) ahead of time.
+    
+    Lets callers overlap these imports with other work, such as the Excel
+    conversion, before generate_edits_with_ai runs.
+    
+    Args:
+        skip_api: Whether API calls will be skipped (no SDK needed)
+    """
+    try:
+        _import_script('ai_policy_processor')
+    except Exception:
+        # Reported properly when generate_edits_with_ai imports it again
+        return
+    if not skip_api:
+        try:
+            from .claude_api import load_anthropic
+            load_anthropic()
+        except ImportError:
+            # Reported properly when the API is actually called
+            pass
+
+
+def _compute_inputs_signature(file_paths: List[str], extra_data: Optional[str] = None) -> str:
+    """
+    Compute a content signature for the AI generation inputs.
+    
+    Args:
+        file_paths: Input files whose bytes determine the AI output
+        extra_data: Additional inline input (e.g. questionnaire JSON)
+        
+    Returns:
+        Hex digest of all inputs
+    """
+    key = hashlib.blake2b()
+    for file_path in file_paths:
+        key.update(Path(file_path).read_bytes())
+    if extra_data is not None:
+        key.update(extra_data.encode('utf-8'))
+    return key.hexdigest()
+
+
+def _read_signature(sig_path: str) -> Optional[str]:
+    """Read a previously stored inputs signature, if any."""
+    try:
+        with open(sig_path, 'r', encoding='utf-8') as f:
+            return f.read().strip()
+    except OSError:
+        return None
 
 
 def generate_edits_with_ai(policy_path: str, questionnaire_csv: Optional[str], 
                           prompt_path: str, policy_instructions_path: str, 
                           output_json: str, api_key: str, skip_api: bool = False, 
-                          questionnaire_json: Optional[str] = None) -> Tuple[bool, str]:
+                          questionnaire_json: Optional[str] = None,
+                          use_cache: bool = True) -> Tuple[bool, str]:
     """
     Generate JSON instructions using AI or use existing file.
     
@@ -93,11 +174,36 @@ def generate_edits_with_ai(policy_path: str, questionnaire_csv: Optional[str],
         api_key: Claude API key
         skip_api: Whether to skip API call
         questionnaire_json: JSON questionnaire data (optional)
+        use_cache: Reuse the existing output when the inputs are unchanged
         
     Returns:
         Tuple of (success: bool, output_or_error: str)
     """
     temp_json_file = None
+    sig_path = f"{output_json}.sig"
+    signature = None
+    
+    # Skip the Claude call entirely when the inputs are unchanged since the last run.
+    # The model and the prompt-building code are inputs too, so changing either
+    # invalidates the cache
+    if not skip_api:
+        try:
+            input_files = [policy_path, prompt_path, policy_instructions_path,
+                           claude_api.__file__,
+                           str(Path(__file__).parent.parent / 'ai_policy_processor.py')]
+            if not questionnaire_json and questionnaire_csv:
+                input_files.append(questionnaire_csv)
+            signature = _compute_inputs_signature(
+                input_files, f"{claude_api.CLAUDE_MODEL}\n{questionnaire_json or ''}")
+        except OSError as e:
+            print(f"⚠️  Could not compute input signature, cache disabled: {e}")
+        
+        if not use_cache:
+            print("🔁 AI edits cache bypassed - requesting a fresh generation")
+        elif signature and os.path.exists(output_json) and _read_signature(sig_path) == signature:
+            print(f"♻️  Inputs unchanged since last run - cache hit, skipping AI call")
+            print(f"📁 Reusing: {output_json}")
+            return True, ""
     
     try:
         # Determine questionnaire parameter based on input type
@@ -106,7 +212,7 @@ def generate_edits_with_ai(policy_path: str, questionnaire_csv: Optional[str],
             env_data = os.environ.get('QUESTIONNAIRE_ANSWERS_DATA')
             if env_data and len(questionnaire_json) == len(env_data):
                 # Use environment variable approach - no temp files needed!
-                questionnaire_param = f"--questionnaire-env-data"
+                questionnaire_args = ['--questionnaire-env-data']
                 print("🧠 Step 2: Using environment variable questionnaire data (production mode)...")
             else:
                 # Fallback to temp file approach 
@@ -117,34 +223,37 @@ def generate_edits_with_ai(policy_path: str, questionnaire_csv: Optional[str],
                 json.dump(json.loads(questionnaire_json), temp_json_file, indent=2)
                 temp_json_file.close()
                 
-                questionnaire_param = f"--questionnaire '{temp_json_file.name}'"
+                questionnaire_args = ['--questionnaire', temp_json_file.name]
                 print("🧠 Step 2: Using temp file questionnaire data (fallback mode)...")
                 print(f"📁 Temp JSON file: {temp_json_file.name}")
         else:
             # Use file path (legacy approach)
-            questionnaire_param = f"--questionnaire '{questionnaire_csv}'"
+            questionnaire_args = ['--questionnaire', questionnaire_csv]
             print("🧠 Step 2: Using questionnaire file (legacy mode)...")
         
+        argv = [
+            '--policy', policy_path,
+            *questionnaire_args,
+            '--prompt', prompt_path,
+            '--policy-instructions', policy_instructions_path,
+            '--output', output_json
+        ]
+        
         if skip_api:
             print("🔄 API call skipped for testing/development...")
-            cmd = f"""python3 scripts/ai_policy_processor.py \
-                --policy '{policy_path}' \
-                {questionnaire_param} \
-                --prompt '{prompt_path}' \
-                --policy-instructions '{policy_instructions_path}' \
-                --output '{output_json}' \
-                --skip-api"""
+            argv.append('--skip-api')
         else:
             print("🧠 Generating JSON instructions with Claude Sonnet 4...")
-            cmd = f"""python3 scripts/ai_policy_processor.py \
-                --policy '{policy_path}' \
-                {questionnaire_param} \
-                --prompt '{prompt_path}' \
-                --policy-instructions '{policy_instructions_path}' \
-                --output '{output_json}' \
-                --api-key '{api_key}'"""
-        
-        result = run_command(cmd, "Processing JSON instructions")
+            argv += ['--api-key', api_key]
+        
+        result = _run_script('ai_policy_processor', argv, "Processing JSON instructions")
+        
+        if result[0] and signature:
+            try:
+                with open(sig_path, 'w', encoding='utf-8') as f:
+                    f.write(signature)
+            except OSError as e:
+                print(f"⚠️  Warning: Could not write input signature {sig_path}: {e}")
         
         return result
         
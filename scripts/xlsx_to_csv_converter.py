@@ -3,41 +3,60 @@
 Convert XLSX questionnaire responses to CSV format for AI processing.
 This makes it easier for AI to read the customer data.
 """
-import pandas as pd
+import csv
+import openpyxl
 import sys
 import os
 
 def convert_xlsx_to_csv(xlsx_path, csv_path):
     """Convert XLSX to CSV format."""
+    # Write to a temp file and swap it in, so a failed run never leaves a
+    # truncated CSV behind for the AI step to pick up
+    tmp_path = csv_path + ".tmp"
     try:
-        # Read the Excel file
-        df = pd.read_excel(xlsx_path)
-        
-        # Save as CSV
-        df.to_csv(csv_path, index=False, encoding='utf-8')
+        # Stream rows straight from the sheet - no DataFrame is built
+        workbook = openpyxl.load_workbook(xlsx_path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows, ())
+            row_count = 0
+            
+            with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(['' if v is None else v for v in header])
+                for row in rows:
+                    writer.writerow(['' if v is None else v for v in row])
+                    row_count += 1
+        finally:
+            workbook.close()
+        os.replace(tmp_path, csv_path)
         
         print(f"✅ Converted {xlsx_path} to {csv_path}")
-        print(f"📊 Data shape: {df.shape[0]} rows, {df.shape[1]} columns")
+        print(f"📊 Data shape: {row_count} rows, {len(header)} columns")
         
         # Show preview
         print(f"\n📋 Column names:")
-        for i, col in enumerate(df.columns, 1):
+        for i, col in enumerate(header, 1):
             print(f"   {i}. {col}")
         
         return True
         
     except Exception as e:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
         print(f"❌ Error converting file: {e}")
         return False
 
-def main():
-    if len(sys.argv) != 3:
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2:
         print("Usage: python3 xlsx_to_csv_converter.py input.xlsx output.csv")
         print("Example: python3 xlsx_to_csv_converter.py data/questionnaire.xlsx data/questionnaire.csv")
         sys.exit(1)
     
-    xlsx_path = sys.argv[1]
-    csv_path = sys.argv[2]
+    xlsx_path, csv_path = argv
     
     if not os.path.exists(xlsx_path):
         print(f"❌ Input file not found: {xlsx_path}")
@@ -48,6 +48,11 @@ export function useSocket(url: string = getApiUrl()): UseSocketReturn {
       setLogs((prev) => [...prev, data]);
     });
 
+    // Script output arrives batched to cut per-line websocket frames
+    socket.on('log_batch', (data: { entries: LogEntry[] }) => {
+      setLogs((prev) => [...prev, ...data.entries]);
+    });
+
     socket.on('progress_update', (data: ProgressUpdate) => {
       setProgress(data);
     });
@@ -13,19 +13,40 @@ The application is organized into separate modules:
 """
 
 import os
+
+# Green servers need sockets, threads and sleeps patched before anything else
+# imports them, so blocking GitHub requests and downloads yield to other clients.
+# Read from the process environment because .env is loaded further down.
+SOCKETIO_ASYNC_MODE = os.environ.get('SOCKETIO_ASYNC_MODE')
+if SOCKETIO_ASYNC_MODE == 'eventlet':
+    import eventlet
+    eventlet.monkey_patch()
+elif SOCKETIO_ASYNC_MODE == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+
 import sys
 import signal
 import time
+import shutil
 import zipfile
-import io
-import threading
+import tempfile
 from datetime import datetime
 from pathlib import Path
 
-from flask import Flask, request, jsonify, send_file, Response
+from flask import Flask, request, jsonify, send_file
+from werkzeug.utils import send_file as werkzeug_send_file
+from flask.json.provider import DefaultJSONProvider
+from flask_cors import CORS
 from flask_socketio import SocketIO, emit
 from dotenv import load_dotenv
 
+# orjson is optional - Socket.IO falls back to the standard json encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add the parent directory to sys.path for script imports
 sys.path.append(str(Path(__file__).parent.parent))
 
@@ -35,7 +56,10 @@ load_dotenv(Path(__file__).parent.parent / '.env')
 # Import our custom modules
 from config import (
     APP_SECRET_KEY, DEFAULT_HOST, DEFAULT_PORT, DEFAULT_POLICY_FILE, 
-    DEFAULT_OUTPUT_NAME, setup_cors_headers, get_project_root, get_environment_debug_info
+    CORS_ALLOWED_HEADERS, CORS_ALLOWED_METHODS, CORS_MAX_AGE,
+    get_project_root, get_environment_debug_info, get_output_name,
+    ARTIFACT_CHUNK_SIZE, ARTIFACT_SPOOL_MAX_SIZE, ARTIFACT_CACHE_DIR, ARTIFACT_CACHE_TTL,
+    ARTIFACT_CACHE_MAX_SIZE, env_flag, path_exists_cached
 )
 from models import GeneratedFile
 from automation import AutomationRunner
@@ -45,27 +69,89 @@ from automation import AutomationRunner
 # FLASK APPLICATION SETUP
 # =============================================================================
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, used for jsonify() responses."""
+    
+    def dumps(self, obj, **kwargs) -> str:
+        # Types orjson does not handle natively use Flask's default conversions
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_SORT_KEYS).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 def create_app() -> Flask:
     """Create and configure the Flask application."""
     app = Flask(__name__)
     app.config['SECRET_KEY'] = APP_SECRET_KEY
+    if orjson:
+        app.json = OrjsonProvider(app)
+    # Behind nginx/Apache, hand local file downloads to the proxy via X-Sendfile
+    app.config['USE_X_SENDFILE'] = env_flag('USE_X_SENDFILE')
     
-    # Add CORS headers to all responses
-    @app.after_request
-    def after_request(response):
-        return setup_cors_headers(response)
+    # Add CORS headers to all responses; browsers may cache preflights for CORS_MAX_AGE
+    CORS(app, origins='*', send_wildcard=True, allow_headers=CORS_ALLOWED_HEADERS,
+         methods=CORS_ALLOWED_METHODS, max_age=CORS_MAX_AGE)
     
     return app
 
 
+class OrjsonCodec:
+    """json-compatible codec for Socket.IO packets backed by orjson."""
+    
+    @staticmethod
+    def dumps(obj, **kwargs) -> str:
+        # orjson output is already compact, so separators are ignored
+        return orjson.dumps(obj).decode('utf-8')
+    
+    @staticmethod
+    def loads(data, **kwargs):
+        return orjson.loads(data)
+
+
 # Create Flask app and SocketIO
 app = create_app()
-socketio = SocketIO(app, cors_allowed_origins="*")
+socketio_options = {'json': OrjsonCodec} if orjson else {}
+# Optional scale-out: an eventlet/gevent server and a message queue (e.g.
+# redis://localhost:6379/0) so emits fan out across server processes
+if SOCKETIO_ASYNC_MODE:
+    socketio_options['async_mode'] = SOCKETIO_ASYNC_MODE
+if os.environ.get('SOCKETIO_MESSAGE_QUEUE'):
+    socketio_options['message_queue'] = os.environ['SOCKETIO_MESSAGE_QUEUE']
+socketio = SocketIO(app, cors_allowed_origins="*", **socketio_options)
 
 # Global automation runner instance
 runner = AutomationRunner(socketio)
 
 
+def _prepare_artifact_cache_dir() -> Path:
+    """
+    Create the artifact cache directory and make sure only this user can use it.
+    
+    Cached files are served without asking GitHub, so a directory another
+    user could write to would let them plant artifacts. If the configured
+    directory is not a real directory owned by this user, a fresh private
+    temporary directory is used instead.
+    """
+    try:
+        ARTIFACT_CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if ARTIFACT_CACHE_DIR.is_symlink() or not ARTIFACT_CACHE_DIR.is_dir():
+            raise OSError("not a directory")
+        info = ARTIFACT_CACHE_DIR.stat()
+        if hasattr(os, 'getuid') and info.st_uid != os.getuid():
+            raise OSError("owned by another user")
+        if info.st_mode & 0o077:
+            ARTIFACT_CACHE_DIR.chmod(0o700)
+        return ARTIFACT_CACHE_DIR
+    except OSError as e:
+        fallback = Path(tempfile.mkdtemp(prefix='policy_artifacts_'))
+        print(f"⚠️ Artifact cache {ARTIFACT_CACHE_DIR} unusable ({e}), using {fallback}")
+        return fallback
+
+
+artifact_cache_dir = _prepare_artifact_cache_dir()
+
+
 # =============================================================================
 # REST API ENDPOINTS
 # =============================================================================
@@ -101,10 +187,10 @@ def get_status():
     policy_path = get_project_root() / policy_file
     
     api_key = os.environ.get('CLAUDE_API_KEY', '')
-    skip_api = os.environ.get('SKIP_API_CALL', '').lower() in ['true', '1', 'yes', 'on']
+    skip_api = env_flag('SKIP_API_CALL')
     
     return jsonify({
-        'policy_exists': policy_path.exists(),
+        'policy_exists': path_exists_cached(policy_path),
         'questionnaire_exists': True,  # Always true - we only use localStorage data
         'api_key_configured': bool(api_key) or skip_api,
         'skip_api': skip_api,
@@ -132,7 +218,6 @@ def start_automation():
         return jsonify({'error': 'Automation is already running'}), 400
     
     data = request.get_json() or {}
-    print(f"🔍 DEBUG: Full request data keys: {list(data.keys())}")
     
     # Extract request parameters
     skip_api = data.get('skip_api', False)
@@ -140,18 +225,16 @@ def start_automation():
     user_id = data.get('user_id')
     timestamp = data.get('timestamp', int(time.time() * 1000))
     
-    print(f"🔍 DEBUG: Questionnaire answers count: {len(questionnaire_answers)}")
-    print(f"🔍 DEBUG: User ID: {user_id}")
     print(f"🚀 Starting automation with {len(questionnaire_answers)} questionnaire answers")
-    print(f"📊 Answer fields: {list(questionnaire_answers.keys())}")
+    if env_flag('WEB_UI_DEBUG'):
+        print(f"🔍 DEBUG: Full request data keys: {list(data.keys())}")
+        print(f"🔍 DEBUG: User ID: {user_id}")
+        print(f"📊 Answer fields: {list(questionnaire_answers.keys())}")
     
-    # Start automation in a separate thread
-    runner.thread = threading.Thread(
-        target=runner.run_automation,
-        args=(skip_api, questionnaire_answers, timestamp, user_id),
-        daemon=True
+    # Start automation as a Socket.IO background task so it can emit safely
+    runner.thread = socketio.start_background_task(
+        runner.run_automation, skip_api, questionnaire_answers, timestamp, user_id
     )
-    runner.thread.start()
     
     return jsonify({
         'message': 'Automation started',
@@ -185,12 +268,16 @@ def download_file(filename: str):
     # Handle regular files
     file_path = get_project_root() / filename
     
-    print(f"Download request for: {filename}")
-    print(f"Looking for file at: {file_path.absolute()}")
-    print(f"File exists: {file_path.exists()}")
+    if env_flag('WEB_UI_DEBUG'):
+        print(f"🔍 DEBUG: Download request for: {filename}")
+        print(f"🔍 DEBUG: Looking for file at: {file_path.absolute()}")
     
-    if file_path.exists() and file_path.is_file():
-        return send_file(str(file_path.absolute()), as_attachment=True)
+    if file_path.is_file():
+        # Conditional responses honor Range/If-None-Match, so retried downloads resume
+        response = send_file(file_path, as_attachment=True, conditional=True, etag=True, max_age=0)
+        # DOCX is already deflate-compressed; keep proxies from gzipping it again
+        response.cache_control.no_transform = True
+        return response
     else:
         return jsonify({'error': 'File not found'}), 404
 
@@ -200,58 +287,177 @@ def download_github_artifact(artifact_id: str):
     Download and extract DOCX file from GitHub Actions artifact.
     
     This function:
-    1. Downloads the artifact zip file from GitHub
-    2. Extracts the DOCX file from the zip
-    3. Returns the DOCX file with a user-friendly name
+    1. Serves the DOCX from the local artifact cache if it is still fresh
+    2. Otherwise downloads the artifact zip file from GitHub
+    3. Extracts the DOCX file from the zip into the cache
+    4. Returns the DOCX file with a user-friendly name
     """
+    # Artifact IDs are positive integers; reject anything else before it costs
+    # a GitHub request or reaches the cache path
+    if not (artifact_id.isascii() and artifact_id.isdigit()) or int(artifact_id) <= 0:
+        return jsonify({'error': 'Invalid artifact ID'}), 400
+    artifact_id = str(int(artifact_id))
+    
+    # Artifacts never change, so a client that already has this one can keep it
+    etag = f"artifact-{artifact_id}"
+    if request.if_none_match.contains(etag):
+        return '', 304, {'ETag': f'"{etag}"'}
+    
+    # Generate user-friendly filename
+    friendly_filename = f"{get_output_name()}.docx"
+    
+    # Likewise a cached copy saves the download and the quota
+    cache_path = artifact_cache_dir / f"{artifact_id}.docx"
+    if _is_cached_artifact_fresh(cache_path):
+        return _send_artifact_docx(cache_path, friendly_filename, etag)
+    
     github_token = os.environ.get('GITHUB_TOKEN')
     
     if not github_token or not runner.github_monitor.repo_owner or not runner.github_monitor.repo_name:
         return jsonify({'error': 'GitHub access not configured'}), 400
     
+    # Don't spend requests while the GitHub quota is exhausted
+    retry_after = runner.github_monitor.rate_limit_wait()
+    if retry_after:
+        response = jsonify({'error': 'GitHub rate limit reached', 'retry_after': int(retry_after) + 1})
+        response.headers['Retry-After'] = str(int(retry_after) + 1)
+        return response, 429
+    
     try:
-        # Download artifact from GitHub
-        response = runner.github_monitor._make_github_request(f'actions/artifacts/{artifact_id}/zip')
+        # Download artifact from GitHub without buffering it in memory
+        response = runner.github_monitor._make_github_request(
+            f'actions/artifacts/{artifact_id}/zip', stream=True)
         
-        if not response or response.status_code != 200:
-            error_msg = f'Failed to download artifact from GitHub (status: {response.status_code if response else "No response"})'
+        if response is None or response.status_code != 200:
+            error_msg = f'Failed to download artifact from GitHub (status: {response.status_code if response is not None else "No response"})'
+            if response is not None:
+                response.close()
             return jsonify({'error': error_msg}), 500
         
-        # Extract DOCX from zip file
-        zip_data = io.BytesIO(response.content)
-        
-        try:
-            with zipfile.ZipFile(zip_data, 'r') as zip_file:
+        # Spool the zip to a temporary file (in memory only while small)
+        with tempfile.SpooledTemporaryFile(max_size=ARTIFACT_SPOOL_MAX_SIZE) as spool:
+            try:
+                for chunk in response.iter_content(chunk_size=ARTIFACT_CHUNK_SIZE):
+                    spool.write(chunk)
+            finally:
+                response.close()
+            spool.seek(0)
+            
+            # Extract DOCX from zip file
+            try:
+                zip_file = zipfile.ZipFile(spool, 'r')
+            except zipfile.BadZipFile:
+                return jsonify({'error': 'Invalid zip file from GitHub artifact'}), 500
+            
+            with zip_file:
                 # Find the first .docx file in the zip (exclude macOS metadata)
-                docx_files = [f for f in zip_file.namelist() 
-                            if f.endswith('.docx') and not f.startswith('__MACOSX')]
+                docx_info = next((info for info in zip_file.infolist()
+                                  if info.filename.endswith('.docx')
+                                  and not info.filename.startswith('__MACOSX')), None)
                 
-                if not docx_files:
+                if docx_info is None:
                     return jsonify({'error': 'No DOCX file found in artifact'}), 404
                 
-                # Extract the first DOCX file
-                docx_filename = docx_files[0]
-                docx_content = zip_file.read(docx_filename)
-                
-                # Generate user-friendly filename
-                output_name = os.environ.get('OUTPUT_NAME', DEFAULT_OUTPUT_NAME)
-                friendly_filename = f"{output_name}.docx"
-                
-                return Response(
-                    docx_content,
-                    headers={
-                        'Content-Disposition': f'attachment; filename="{friendly_filename}"',
-                        'Content-Type': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-                    }
-                )
-                
-        except zipfile.BadZipFile:
-            return jsonify({'error': 'Invalid zip file from GitHub artifact'}), 500
+                _store_artifact_docx(zip_file, docx_info, cache_path)
+        
+        _evict_artifact_cache(keep=cache_path)
+        return _send_artifact_docx(cache_path, friendly_filename, etag)
             
     except Exception as e:
         return jsonify({'error': f'Download failed: {str(e)}'}), 500
 
 
+def _is_cached_artifact_fresh(cache_path: Path) -> bool:
+    """Check whether a cached artifact DOCX exists and is younger than ARTIFACT_CACHE_TTL."""
+    try:
+        return time.time() - cache_path.stat().st_mtime < ARTIFACT_CACHE_TTL
+    except OSError:
+        return False
+
+
+def _store_artifact_docx(zip_file: zipfile.ZipFile, docx_info: zipfile.ZipInfo, cache_path: Path) -> None:
+    """Extract a DOCX from the artifact zip into the cache, replacing it atomically."""
+    temp_file = tempfile.NamedTemporaryFile(dir=artifact_cache_dir, suffix='.part', delete=False)
+    try:
+        with temp_file, zip_file.open(docx_info) as docx_stream:
+            shutil.copyfileobj(docx_stream, temp_file, ARTIFACT_CHUNK_SIZE)
+        os.replace(temp_file.name, cache_path)
+    except Exception:
+        os.unlink(temp_file.name)
+        raise
+
+
+def _evict_artifact_cache(keep: Path) -> None:
+    """Drop expired artifacts, then the oldest ones while the cache exceeds ARTIFACT_CACHE_MAX_SIZE."""
+    entries = []
+    for path in artifact_cache_dir.glob('*.docx'):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    
+    entries.sort()
+    total_size = sum(size for _, size, _ in entries)
+    expired_before = time.time() - ARTIFACT_CACHE_TTL
+    
+    for mtime, size, path in entries:
+        if path == keep:
+            continue
+        if mtime >= expired_before and total_size <= ARTIFACT_CACHE_MAX_SIZE:
+            break
+        try:
+            path.unlink()
+            total_size -= size
+        except OSError:
+            pass
+
+
+def _send_artifact_docx(cache_path: Path, friendly_filename: str, etag: str):
+    """Send a cached artifact DOCX as an attachment tagged with the artifact's ETag."""
+    # Always streamed by Flask: the proxy is not expected to serve the
+    # private cache directory even when USE_X_SENDFILE is enabled
+    response = werkzeug_send_file(
+        cache_path,
+        request.environ,
+        mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+        as_attachment=True,
+        download_name=friendly_filename,
+        conditional=True,
+        etag=etag,
+        max_age=0,
+        use_x_sendfile=False,
+        response_class=app.response_class
+    )
+    response.cache_control.no_transform = True
+    return response
+
+
+@app.route('/webhook/github', methods=['POST'])
+def github_webhook():
+    """
+    Receive GitHub workflow_run webhook events.
+    
+    Requires GITHUB_WEBHOOK_SECRET to be set to the secret configured on the
+    repository webhook; requests with a missing or invalid
+    X-Hub-Signature-256 header are rejected.
+    """
+    monitor = runner.github_monitor
+    if not monitor.webhook_secret:
+        return jsonify({'error': 'Webhook not configured'}), 404
+    
+    if not monitor.verify_webhook_signature(request.get_data(),
+                                            request.headers.get('X-Hub-Signature-256')):
+        return jsonify({'error': 'Invalid signature'}), 401
+    
+    event = request.headers.get('X-GitHub-Event', '')
+    if event == 'ping':
+        return jsonify({'message': 'pong'})
+    
+    handled = monitor.handle_webhook_event(event, request.get_json(silent=True) or {})
+    return jsonify({'handled': handled})
+
+
 # =============================================================================
 # WEBSOCKET EVENT HANDLERS
 # =============================================================================
@@ -310,7 +516,8 @@ def main():
             debug=False,
             host=DEFAULT_HOST,
             port=DEFAULT_PORT,
-            allow_unsafe_werkzeug=True
+            # Only the threading mode falls back to the Werkzeug development server
+            allow_unsafe_werkzeug=socketio.async_mode == 'threading'
         )
     except KeyboardInterrupt:
         print("\n🛑 Server stopped by user")
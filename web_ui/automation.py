@@ -9,23 +9,74 @@ This module handles:
 """
 
 import os
+import collections
+import selectors
+import signal
 import subprocess
 import threading
 import time
 import json
+import re
 import tempfile
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 
+# orjson is optional - questionnaire data falls back to the standard json encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from config import (
-    DEFAULT_POLICY_FILE, DEFAULT_OUTPUT_NAME, MAX_ENV_SIZE,
+    DEFAULT_POLICY_FILE, MAX_ENV_SIZE, AUTOMATION_SCRIPT_PATH,
     WORKFLOW_MONITORING_RETRIES, WORKFLOW_MONITORING_DELAY,
-    get_project_root, get_log_level, get_environment_debug_info, is_recent_workflow
+    LOG_BATCH_INTERVAL, LOG_BATCH_MAX_ENTRIES, OUTPUT_READ_SIZE,
+    WORKFLOW_CLOCK_SKEW, get_project_root, get_log_level, get_environment_debug_info,
+    get_output_name
 )
 from models import GeneratedFile
 from github_monitor import GitHubActionsMonitor
 
+# Script output markers that drive the progress steps, matched in one scan
+_WORKFLOW_TRIGGERED = "GitHub Actions workflow triggered successfully"
+_PROGRESS_MARKER_RE = re.compile('|'.join(re.escape(marker) for marker in (
+    "STEP 2:", "STEP 3:", _WORKFLOW_TRIGGERED, "AUTOMATION COMPLETE"
+)))
+
+# (second, "HH:MM:SS") for the most recent log timestamp
+_timestamp_cache = (0, '')
+
+
+def _current_timestamp() -> str:
+    """Return the local HH:MM:SS time, formatting it at most once per second."""
+    global _timestamp_cache
+    second = int(time.time())
+    cached = _timestamp_cache
+    if cached[0] != second:
+        cached = (second, time.strftime("%H:%M:%S", time.localtime(second)))
+        _timestamp_cache = cached
+    return cached[1]
+
+
+def _scan_docx(directory: Path, prefix: str = '') -> List[Tuple[str, int]]:
+    """
+    List (name, size) of the DOCX files directly inside a directory.
+    
+    One scandir pass reuses the file type from the directory listing, so only
+    matching files are stat'ed. A missing directory yields no files.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return [
+                (entry.name, entry.stat().st_size)
+                for entry in entries
+                if entry.name.endswith('.docx') and entry.name.startswith(prefix)
+                and entry.is_file()
+            ]
+    except FileNotFoundError:
+        return []
+
 
 class AutomationRunner:
     """
@@ -43,7 +94,16 @@ class AutomationRunner:
         self.process: Optional[subprocess.Popen] = None
         self.thread: Optional[threading.Thread] = None
         self.running = False
-        self.github_monitor = GitHubActionsMonitor()
+        # Set by stop() to cancel the wait for a new workflow run
+        self._stop_event = threading.Event()
+        self.github_monitor = GitHubActionsMonitor(
+            start_background_task=socketio_instance.start_background_task)
+        
+        # Log lines are buffered and sent to clients in batches
+        self._log_buffer: collections.deque = collections.deque()
+        self._log_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._log_flusher_started = False
         
         # Progress tracking
         self.steps = [
@@ -54,19 +114,56 @@ class AutomationRunner:
             "Complete"
         ]
         self.current_step = 0
+        self._script_started_at = datetime.now(timezone.utc)
     
     def emit_log(self, message: str, level: str = "info", step: Optional[int] = None) -> None:
-        """Emit a log message to all connected WebSocket clients."""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.socketio.emit('log_message', {
-            'timestamp': timestamp,
+        """Queue a log message for the next batch sent to WebSocket clients."""
+        entry = {
+            'timestamp': _current_timestamp(),
             'message': message,
             'level': level,
             'step': step
-        })
+        }
+        
+        with self._log_lock:
+            self._log_buffer.append(entry)
+            buffer_full = len(self._log_buffer) >= LOG_BATCH_MAX_ENTRIES
+            
+            if not self._log_flusher_started:
+                self._log_flusher_started = True
+                self.socketio.start_background_task(self._flush_logs_loop)
+        
+        # Surface failures right away, and send a full batch early rather
+        # than letting a burst of output grow the buffer without bound
+        if level == 'error' or buffer_full:
+            self.flush_logs()
+    
+    def flush_logs(self) -> None:
+        """Send all buffered log messages to clients as log_batch events."""
+        with self._flush_lock:
+            with self._log_lock:
+                if not self._log_buffer:
+                    return
+                entries = list(self._log_buffer)
+                self._log_buffer.clear()
+            
+            for start in range(0, len(entries), LOG_BATCH_MAX_ENTRIES):
+                self.socketio.emit('log_batch', {
+                    'entries': entries[start:start + LOG_BATCH_MAX_ENTRIES]})
+    
+    def _flush_logs_loop(self) -> None:
+        """Background task that flushes buffered log messages periodically."""
+        while True:
+            self.socketio.sleep(LOG_BATCH_INTERVAL)
+            try:
+                self.flush_logs()
+            except Exception as e:
+                print(f"Error flushing logs: {e}")
     
     def update_progress(self, step: int, status: str = "active") -> None:
         """Update the current progress step and notify clients."""
+        # Send pending log lines first so clients see events in order
+        self.flush_logs()
         self.current_step = step
         progress_percent = (step / len(self.steps)) * 100
         
@@ -116,27 +213,31 @@ class AutomationRunner:
         temp_file_path = None
         
         try:
-            questionnaire_json_str = json.dumps(questionnaire_answers)
-            data_size = len(questionnaire_json_str)
+            # Encoded once to UTF-8 bytes; large payloads (e.g. embedded logos)
+            # go to the temp file as-is without an intermediate str copy
+            if orjson:
+                questionnaire_json = orjson.dumps(questionnaire_answers)
+            else:
+                questionnaire_json = json.dumps(questionnaire_answers).encode('utf-8')
+            data_size = len(questionnaire_json)
             
             if data_size <= MAX_ENV_SIZE:
                 # Small data - use environment variable (production-friendly)
-                env['QUESTIONNAIRE_ANSWERS_DATA'] = questionnaire_json_str
+                env['QUESTIONNAIRE_ANSWERS_DATA'] = questionnaire_json.decode('utf-8')
                 env['QUESTIONNAIRE_SOURCE'] = 'direct_api'
                 self.emit_log("📊 Using environment variable for questionnaire data", "info")
-                self.emit_log(f"📏 Data size: {data_size} characters", "info")
+                self.emit_log(f"📏 Data size: {data_size} bytes", "info")
             else:
                 # Large data - use temporary file approach
-                temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
-                temp_file.write(questionnaire_json_str)
-                temp_file.close()
+                with tempfile.NamedTemporaryFile(mode='wb', suffix='.json', delete=False) as temp_file:
+                    temp_file.write(questionnaire_json)
                 
                 temp_file_path = temp_file.name
                 env['QUESTIONNAIRE_ANSWERS_JSON'] = temp_file_path
                 env['QUESTIONNAIRE_SOURCE'] = 'direct_api'
                 
                 self.emit_log("📊 Using temporary file for questionnaire data (large size)", "warning")
-                self.emit_log(f"📏 Data size: {data_size} characters (>{MAX_ENV_SIZE} limit)", "info")
+                self.emit_log(f"📏 Data size: {data_size} bytes (>{MAX_ENV_SIZE} limit)", "info")
                 self.emit_log(f"📄 Temp file: {temp_file_path}", "info")
             
             return env, temp_file_path
@@ -181,45 +282,83 @@ class AutomationRunner:
     
     def _execute_automation_script(self, env: Dict[str, str]) -> bool:
         """Execute the automation script and handle real-time output."""
-        script_path = get_project_root() / "quick_automation.sh"
+        script_path = AUTOMATION_SCRIPT_PATH
         
         try:
+            self._script_started_at = datetime.now(timezone.utc)
             self.process = subprocess.Popen(
                 [str(script_path)],
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                universal_newlines=True,
-                bufsize=1,
                 env=env,
-                cwd=get_project_root()
+                cwd=get_project_root(),
+                # Own process group: Ctrl+C on the server does not hit the script,
+                # and stop() can signal the script together with its children
+                start_new_session=True
             )
             
-            # Process output line by line
-            while self.running and self.process.poll() is None:
-                line = self.process.stdout.readline()
-                if line:
-                    clean_line = line.strip()
-                    if clean_line:
-                        level = get_log_level(clean_line)
-                        self.emit_log(clean_line, level)
-                        self._update_progress_from_output(clean_line)
+            # Process output line by line until the pipe closes, so lines
+            # written just before the script exits are not dropped
+            for line in self._iter_output_lines():
+                clean_line = line.strip()
+                if clean_line:
+                    level = get_log_level(clean_line)
+                    self.emit_log(clean_line, level)
+                    self._update_progress_from_output(clean_line)
             
-            return self.process.returncode == 0
+            return self.process.wait() == 0
             
         except Exception as e:
             self.emit_log(f"❌ Failed to execute automation script: {str(e)}", "error")
             return False
     
+    def _iter_output_lines(self):
+        """
+        Yield decoded output lines from the automation process.
+        
+        Reads the pipe in large non-blocking chunks via a selector, so one
+        read can carry many lines and a stop request is noticed within the
+        select timeout even while the script is silent.
+        """
+        fd = self.process.stdout.fileno()
+        os.set_blocking(fd, False)
+        buffer = b''
+        
+        with selectors.DefaultSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            while self.running:
+                if not selector.select(timeout=0.5):
+                    continue
+                try:
+                    chunk = os.read(fd, OUTPUT_READ_SIZE)
+                except BlockingIOError:
+                    continue
+                if not chunk:
+                    break
+                
+                *lines, buffer = (buffer + chunk).split(b'\n')
+                for line in lines:
+                    yield line.decode('utf-8', errors='replace')
+        
+        if buffer and self.running:
+            yield buffer.decode('utf-8', errors='replace')
+    
     def _update_progress_from_output(self, line: str) -> None:
         """Update progress based on automation script output."""
-        if "STEP 2:" in line:
+        match = _PROGRESS_MARKER_RE.search(line)
+        if not match:
+            return
+        
+        marker = match.group()
+        if marker == "STEP 2:":
             self.update_progress(3, "active")
-        elif "STEP 3:" in line:
+        elif marker == "STEP 3:":
             self.update_progress(4, "active")
-        elif "GitHub Actions workflow triggered successfully" in line:
+        elif marker == _WORKFLOW_TRIGGERED:
             self.emit_log("🔍 Monitoring GitHub Actions workflow...", "info")
-            self._start_github_monitoring()
-        elif "AUTOMATION COMPLETE" in line:
+            # Look for the run in the background so script output keeps streaming
+            self.socketio.start_background_task(self._start_github_monitoring)
+        elif marker == "AUTOMATION COMPLETE":
             self.update_progress(4, "completed")
             self.update_progress(5, "completed")
     
@@ -228,34 +367,30 @@ class AutomationRunner:
         try:
             self.emit_log("⏳ Waiting for new workflow to appear in GitHub API...", "info")
             
-            # Try to find the workflow run with retries
+            # Ask GitHub only for dispatch runs created since the script
+            # started, so freshness is filtered server-side
+            created_after = self._script_started_at - timedelta(seconds=WORKFLOW_CLOCK_SKEW)
+            
             for attempt in range(WORKFLOW_MONITORING_RETRIES):
-                time.sleep(WORKFLOW_MONITORING_DELAY)
-                
-                runs = self.github_monitor.get_latest_workflow_runs(limit=3)
+                runs = self.github_monitor.get_latest_workflow_runs(
+                    limit=1, created_after=created_after)
                 
                 if runs:
                     latest_run = runs[0]
-                    
-                    if is_recent_workflow(latest_run.created_at):
-                        self.emit_log(
-                            f"📊 Found recent workflow run #{latest_run.id} (status: {latest_run.status})",
-                            "success"
-                        )
-                        self.github_monitor.monitor_workflow(latest_run.id, self._github_workflow_callback)
-                        return
-                    else:
-                        self.emit_log(
-                            f"⏳ Latest workflow run is older than expected, waiting... "
-                            f"(attempt {attempt+1}/{WORKFLOW_MONITORING_RETRIES})",
-                            "info"
-                        )
-                else:
                     self.emit_log(
-                        f"⏳ No workflow runs found yet, waiting... "
-                        f"(attempt {attempt+1}/{WORKFLOW_MONITORING_RETRIES})",
-                        "info"
+                        f"📊 Found recent workflow run #{latest_run.id} (status: {latest_run.status})",
+                        "success"
                     )
+                    self.github_monitor.monitor_workflow(latest_run.id, self._github_workflow_callback)
+                    return
+                
+                self.emit_log(
+                    f"⏳ No workflow runs found yet, waiting... "
+                    f"(attempt {attempt+1}/{WORKFLOW_MONITORING_RETRIES})",
+                    "info"
+                )
+                if self._stop_event.wait(WORKFLOW_MONITORING_DELAY):
+                    return
             
             # Could not find a recent workflow
             self.emit_log("⚠️ Could not find a recent workflow run to monitor after waiting", "warning")
@@ -275,20 +410,21 @@ class AutomationRunner:
         """Process workflow artifacts and emit download links."""
         self.emit_log(f"📦 {len(artifacts)} artifacts available from GitHub Actions", "success")
         
-        output_name = os.environ.get('OUTPUT_NAME', DEFAULT_OUTPUT_NAME)
-        files = []
-        
-        for artifact in artifacts:
-            files.append(GeneratedFile(
-                name=f"{output_name}.docx",
+        file_name = f"{get_output_name()}.docx"
+        files = [
+            GeneratedFile(
+                name=file_name,
                 path=f"github_artifact_{artifact['id']}",
                 size=f"{artifact.get('size_in_bytes', 0) / 1024:.1f} KB",
                 type='docx',
                 download_url=artifact.get('archive_download_url'),
                 artifact_id=str(artifact['id'])
-            ))
+            ).__dict__
+            for artifact in artifacts
+        ]
         
-        self.socketio.emit('files_ready', {'files': [file.__dict__ for file in files]})
+        self.flush_logs()
+        self.socketio.emit('files_ready', {'files': files})
     
     def _handle_workflow_status_update(self, data: Dict[str, Any]) -> None:
         """Handle workflow status updates."""
@@ -330,29 +466,22 @@ class AutomationRunner:
         
         # Check build directory
         build_path = base_path / "build"
-        if build_path.exists():
-            output_name = os.environ.get('OUTPUT_NAME', DEFAULT_OUTPUT_NAME)
-            docx_files = list(build_path.glob(f"{output_name}*.docx"))
-            
-            for docx_file in docx_files:
-                size = docx_file.stat().st_size
-                files.append(GeneratedFile(
-                    name=f'Policy Document - {docx_file.name}',
-                    path=f'build/{docx_file.name}',
-                    size=f"{size / 1024:.1f} KB",
-                    type='docx'
-                ))
+        output_name = get_output_name()
+        for name, size in _scan_docx(build_path, prefix=output_name):
+            files.append(GeneratedFile(
+                name=f'Policy Document - {name}',
+                path=f'build/{name}',
+                size=f"{size / 1024:.1f} KB",
+                type='docx'
+            ))
         
         # Check root directory (exclude original policy file)
         original_policy = os.environ.get('POLICY_FILE', DEFAULT_POLICY_FILE)
-        docx_files = list(base_path.glob("*.docx"))
-        
-        for docx_file in docx_files:
-            if docx_file.name not in original_policy and 'data/' not in str(docx_file):
-                size = docx_file.stat().st_size
+        for name, size in _scan_docx(base_path):
+            if name not in original_policy:
                 files.append(GeneratedFile(
-                    name=f'Policy Document - {docx_file.name}',
-                    path=docx_file.name,
+                    name=f'Policy Document - {name}',
+                    path=name,
                     size=f"{size / 1024:.1f} KB",
                     type='docx'
                 ))
@@ -377,6 +506,7 @@ class AutomationRunner:
         
         try:
             self.running = True
+            self._stop_event.clear()
             self.emit_log("🚀 Starting Policy Automation...", "success")
             
             # Step 1: Validation
@@ -420,6 +550,7 @@ class AutomationRunner:
                     self.emit_log("📄 Policy document is ready for download", "success")
                     file_names = [f.name for f in files]
                     self.emit_log(f"📄 Found {len(files)} document(s): {', '.join(file_names)}", "info")
+                    self.flush_logs()
                     self.socketio.emit('files_ready', {'files': [f.__dict__ for f in files]})
                 else:
                     self.emit_log("📄 No policy documents found yet", "warning")
@@ -438,15 +569,25 @@ class AutomationRunner:
             self.running = False
             self._cleanup_temp_file(temp_file_path)
     
+    def _signal_process_group(self, sig: int) -> None:
+        """Send a signal to the automation script and every process it started."""
+        try:
+            os.killpg(os.getpgid(self.process.pid), sig)
+        except ProcessLookupError:
+            pass
+    
     def stop(self) -> None:
         """Stop the automation process gracefully."""
         self.running = False
+        self._stop_event.set()
+        self.github_monitor.stop()
         if self.process:
             try:
-                self.process.terminate()
-                time.sleep(2)
-                if self.process.poll() is None:
-                    self.process.kill()
+                self._signal_process_group(signal.SIGTERM)
+                try:
+                    self.process.wait(timeout=2)
+                except subprocess.TimeoutExpired:
+                    self._signal_process_group(signal.SIGKILL)
                 self.emit_log("⏹️ Automation stopped by user", "warning")
             except Exception:
                 pass
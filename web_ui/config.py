@@ -9,9 +9,11 @@ This module contains:
 """
 
 import os
-from datetime import datetime, timedelta, timezone
+import re
+import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Tuple
 
 
 # =============================================================================
@@ -23,19 +25,53 @@ APP_SECRET_KEY = 'policy-automation-secret-key-2024'
 DEFAULT_HOST = '0.0.0.0'
 DEFAULT_PORT = 5001
 
+# CORS settings
+CORS_ALLOWED_HEADERS = ['Content-Type', 'Authorization']
+CORS_ALLOWED_METHODS = ['GET', 'PUT', 'POST', 'DELETE', 'OPTIONS']
+CORS_MAX_AGE = 600  # seconds browsers may cache a preflight response
+
 # File paths and naming conventions
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+AUTOMATION_SCRIPT_PATH = PROJECT_ROOT / 'quick_automation.sh'
 DEFAULT_POLICY_FILE = 'data/v5 Freya POL-11 Access Control.docx'
 DEFAULT_OUTPUT_NAME = 'policy_tracked_changes_with_comments'
 
 # GitHub API configuration
 GITHUB_API_BASE = 'https://api.github.com'
 GITHUB_API_TIMEOUT = 10
+GITHUB_API_CONNECT_TIMEOUT = 3.05  # seconds to establish the connection
+GITHUB_API_RETRIES = 3  # retries for 429/5xx responses and connection errors
 WORKFLOW_FILENAME = 'redline-docx.yml'
 
+# Artifact download configuration
+ARTIFACT_CHUNK_SIZE = 64 * 1024  # bytes per read when streaming artifacts
+ARTIFACT_SPOOL_MAX_SIZE = 8 * 1024 * 1024  # artifact zips above this spill to disk
+ARTIFACT_CACHE_DIR = PROJECT_ROOT / '.artifact_cache'  # extracted DOCX per artifact, private to this user
+ARTIFACT_CACHE_TTL = 3600  # seconds an extracted artifact is served from the cache
+ARTIFACT_CACHE_MAX_SIZE = 512 * 1024 * 1024  # oldest cached artifacts are evicted above this
+
 # Automation configuration
 MAX_ENV_SIZE = 32 * 1024  # 32KB conservative limit for environment variables
 WORKFLOW_MONITORING_DELAY = 5  # seconds between workflow checks
+WORKFLOW_QUEUED_DELAY = 10  # seconds between checks while a run is still queued
+WORKFLOW_MAX_BACKOFF = 300  # cap in seconds for backoff after failed checks
+WORKFLOW_UNCHANGED_MAX_DELAY = 60  # cap in seconds for backoff while a run is unchanged
+GITHUB_RATE_LIMIT_FLOOR = 100  # pause polling below this many remaining requests
+ETAG_CACHE_MAX_ENTRIES = 32  # conditional-request cache entries kept per monitor (LRU)
+WEBHOOK_FALLBACK_DELAY = 60  # seconds between safety polls when webhooks are enabled
+
+# Status endpoint configuration
+STATUS_CACHE_TTL = 2  # seconds to reuse filesystem checks in /api/status
+
+# Values accepted as "enabled" for boolean environment flags
+TRUTHY_VALUES = frozenset({'true', '1', 'yes', 'on'})
+
+# Log streaming configuration
+LOG_BATCH_INTERVAL = 0.05  # seconds between batched log_batch emits
+LOG_BATCH_MAX_ENTRIES = 500  # log lines per log_batch event; a full buffer flushes early
+OUTPUT_READ_SIZE = 64 * 1024  # bytes read from the automation script pipe at once
 WORKFLOW_MONITORING_RETRIES = 6  # maximum retries for finding new workflows
+WORKFLOW_CLOCK_SKEW = 30  # seconds of clock skew allowed when matching new runs
 
 # Log level indicators
 LOG_LEVELS = {
@@ -45,6 +81,14 @@ LOG_LEVELS = {
     'INFO': []  # default level
 }
 
+# All indicators compiled into one alternation, one named group per level,
+# so a message is scanned once instead of once per indicator
+_LOG_LEVEL_PATTERN = re.compile('|'.join(
+    f"(?P<{level}>{'|'.join(re.escape(indicator) for indicator in indicators)})"
+    for level, indicators in LOG_LEVELS.items() if indicators
+))
+_LOG_LEVEL_PRIORITY = {level: rank for rank, level in enumerate(LOG_LEVELS)}
+
 
 # =============================================================================
 # UTILITY FUNCTIONS
@@ -52,27 +96,62 @@ LOG_LEVELS = {
 
 def get_project_root() -> Path:
     """Get the project root directory (parent of web_ui)."""
-    return Path(__file__).parent.parent
-
-
-def setup_cors_headers(response):
-    """Add CORS headers to a Flask response."""
-    response.headers['Access-Control-Allow-Origin'] = '*'
-    response.headers['Access-Control-Allow-Headers'] = 'Content-Type,Authorization'
-    response.headers['Access-Control-Allow-Methods'] = 'GET,PUT,POST,DELETE,OPTIONS'
-    return response
+    return PROJECT_ROOT
 
 
 def get_log_level(message: str) -> str:
     """Determine log level based on message content."""
-    for level, indicators in LOG_LEVELS.items():
-        if any(indicator in message for indicator in indicators):
-            return level.lower()
-    return 'info'
-
-
+    # Earlier levels in LOG_LEVELS win when several indicators are present
+    best = None
+    for match in _LOG_LEVEL_PATTERN.finditer(message):
+        level = match.lastgroup
+        if best is None or _LOG_LEVEL_PRIORITY[level] < _LOG_LEVEL_PRIORITY[best]:
+            best = level
+            if _LOG_LEVEL_PRIORITY[level] == 0:
+                break
+    return best.lower() if best else 'info'
+
+
+@lru_cache(maxsize=None)
+def env_flag(name: str) -> bool:
+    """
+    Return whether a boolean environment flag is enabled.
+    
+    The environment is loaded from .env at startup, so each flag is parsed
+    once per process.
+    """
+    value = os.environ.get(name)
+    return value is not None and value.casefold() in TRUTHY_VALUES
+
+
+@lru_cache(maxsize=None)
+def get_output_name() -> str:
+    """Return the base name of generated documents, read from OUTPUT_NAME once per process."""
+    return os.environ.get('OUTPUT_NAME', DEFAULT_OUTPUT_NAME)
+
+
+_path_exists_cache: Dict[Path, Tuple[float, bool]] = {}
+
+
+def path_exists_cached(path: Path) -> bool:
+    """Check whether a path exists, reusing the result for STATUS_CACHE_TTL seconds."""
+    now = time.monotonic()
+    cached = _path_exists_cache.get(path)
+    if cached and cached[0] > now:
+        return cached[1]
+    
+    exists = path.exists()
+    _path_exists_cache[path] = (now + STATUS_CACHE_TTL, exists)
+    return exists
+
+
+@lru_cache(maxsize=1)
 def get_environment_debug_info() -> Dict[str, str]:
-    """Get debug information about environment variables."""
+    """
+    Get debug information about environment variables.
+    
+    Built once per process like env_flag; callers must not modify the result.
+    """
     return {
         'CLAUDE_API_KEY': '***PRESENT***' if os.environ.get('CLAUDE_API_KEY') else 'NOT SET',
         'GITHUB_REPO_OWNER': os.environ.get('GITHUB_REPO_OWNER', 'NOT SET'),
@@ -81,14 +160,3 @@ def get_environment_debug_info() -> Dict[str, str]:
         'GIT_USER_EMAIL': os.environ.get('GIT_USER_EMAIL', 'NOT SET'),
         'GITHUB_TOKEN': '***PRESENT***' if os.environ.get('GITHUB_TOKEN') else 'NOT SET'
     }
-
-
-def is_recent_workflow(created_at: str, max_age_minutes: int = 2) -> bool:
-    """Check if a workflow was created recently."""
-    try:
-        created_time = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-        now = datetime.now(timezone.utc)
-        age = now - created_time
-        return age <= timedelta(minutes=max_age_minutes)
-    except Exception:
-        return False
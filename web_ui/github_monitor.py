@@ -6,22 +6,88 @@ This module handles:
 - Downloading artifacts from completed workflows
 - Extracting repository information from git or environment variables
 - Making authenticated requests to the GitHub API
+- Receiving workflow_run webhook events instead of polling
 """
 
+import hashlib
+import heapq
+import hmac
 import os
 import subprocess
 import threading
 import time
 import re
 import requests
+from collections import OrderedDict
+from datetime import datetime
+from requests.adapters import HTTPAdapter
 from typing import List, Optional, Callable, Any, Dict
+from urllib3.util.retry import Retry
+
+# orjson is optional - GitHub responses fall back to requests' json parser
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from config import (
-    GITHUB_API_BASE, GITHUB_API_TIMEOUT, WORKFLOW_FILENAME,
-    WORKFLOW_MONITORING_DELAY, get_project_root
+    GITHUB_API_BASE, GITHUB_API_TIMEOUT, GITHUB_API_CONNECT_TIMEOUT, GITHUB_API_RETRIES,
+    WORKFLOW_FILENAME,
+    WORKFLOW_MONITORING_DELAY, WORKFLOW_QUEUED_DELAY, WORKFLOW_MAX_BACKOFF,
+    WORKFLOW_UNCHANGED_MAX_DELAY,
+    GITHUB_RATE_LIMIT_FLOOR, WEBHOOK_FALLBACK_DELAY, ETAG_CACHE_MAX_ENTRIES, get_project_root
 )
 from models import WorkflowRun
 
+# Workflow run and artifact fields the web UI uses; the rest of each GitHub
+# payload (head_commit, repository, ...) is dropped before caching
+_RUN_FIELDS = ('id', 'status', 'conclusion', 'created_at', 'updated_at', 'html_url')
+_ARTIFACT_FIELDS = ('id', 'name', 'size_in_bytes', 'archive_download_url')
+
+
+def _pick(item: Dict[str, Any], fields: tuple) -> Dict[str, Any]:
+    """Keep only the given keys of a GitHub API object."""
+    return {field: item[field] for field in fields if field in item}
+
+
+def _slim_run(run: Dict[str, Any]) -> Dict[str, Any]:
+    return _pick(run, _RUN_FIELDS)
+
+
+def _slim_runs(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {'workflow_runs': [_slim_run(run) for run in data.get('workflow_runs', [])]}
+
+
+def _slim_artifacts(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {'artifacts': [_pick(artifact, _ARTIFACT_FIELDS) for artifact in data.get('artifacts', [])]}
+
+
+# owner/repo from HTTPS or SSH remotes; repo names may contain dots
+_GITHUB_URL_RE = re.compile(r'github\.com[:/]([^/]+)/([^/]+?)(?:\.git)?/?$')
+
+
+def _create_session() -> requests.Session:
+    """Create a pooled session that retries transient GitHub API failures."""
+    session = requests.Session()
+    retry = Retry(
+        total=GITHUB_API_RETRIES,
+        backoff_factor=1,
+        status_forcelist=[429, 502, 503, 504],
+        allowed_methods=['GET'],
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=retry))
+    session.headers.update({
+        'Accept': 'application/vnd.github.v3+json',
+        'User-Agent': 'policy-automation-web-ui'
+    })
+    return session
+
+
+# Shared across monitor threads and artifact downloads so connections are reused
+_SESSION = _create_session()
+
 
 class GitHubActionsMonitor:
     """
@@ -33,11 +99,32 @@ class GitHubActionsMonitor:
     - Extract repository information from git or environment variables
     """
     
-    def __init__(self):
+    def __init__(self, start_background_task: Optional[Callable] = None):
+        """
+        Args:
+            start_background_task: Optional starter for the scheduler task,
+                e.g. SocketIO.start_background_task so callbacks can emit
+                safely under any async mode; defaults to a daemon thread
+        """
+        self._start_background_task = start_background_task
         self.github_token = os.environ.get('GITHUB_TOKEN')
+        # Built once; Accept and User-Agent are session defaults
+        self._auth_headers = {'Authorization': f'token {self.github_token}'}
         self.repo_owner: Optional[str] = None
         self.repo_name: Optional[str] = None
         self.workflow_run_id: Optional[int] = None
+        self.webhook_secret = os.environ.get('GITHUB_WEBHOOK_SECRET')
+        
+        # Single-threaded scheduler state for monitored runs
+        self._runs: Dict[int, Dict[str, Any]] = {}
+        self._schedule: List[tuple] = []
+        self._scheduler_cond = threading.Condition()
+        self._scheduler_thread: Optional[threading.Thread] = None
+        # LRU of (endpoint, params) -> (etag, data), bounded by ETAG_CACHE_MAX_ENTRIES
+        self._etag_cache: OrderedDict = OrderedDict()
+        self._etag_lock = threading.Lock()
+        # Epoch time the exhausted GitHub quota resets; 0 while quota remains
+        self._rate_limit_reset = 0.0
         self._extract_repo_info()
     
     def _extract_repo_info(self) -> None:
@@ -65,7 +152,7 @@ class GitHubActionsMonitor:
                 url = result.stdout.strip()
                 if 'github.com' in url:
                     # Parse GitHub URL (both HTTPS and SSH formats)
-                    match = re.search(r'github\.com[:/]([^/]+)/([^/\.]+)', url)
+                    match = _GITHUB_URL_RE.search(url)
                     if match:
                         self.repo_owner = match.group(1)
                         self.repo_name = match.group(2)
@@ -73,33 +160,105 @@ class GitHubActionsMonitor:
             # Git command failed or not available - use environment variables only
             pass
     
-    def _make_github_request(self, endpoint: str, **kwargs) -> Optional[requests.Response]:
+    def _make_github_request(self, endpoint: str, headers: Optional[Dict[str, str]] = None,
+                             **kwargs) -> Optional[requests.Response]:
         """Make an authenticated request to the GitHub API."""
         if not self.github_token or not self.repo_owner or not self.repo_name:
             return None
         
         url = f"{GITHUB_API_BASE}/repos/{self.repo_owner}/{self.repo_name}/{endpoint}"
-        headers = {
-            'Authorization': f'token {self.github_token}',
-            'Accept': 'application/vnd.github.v3+json'
-        }
+        headers = {**headers, **self._auth_headers} if headers else self._auth_headers
         
         try:
-            return requests.get(url, headers=headers, timeout=GITHUB_API_TIMEOUT, **kwargs)
+            response = _SESSION.get(url, headers=headers,
+                                    timeout=(GITHUB_API_CONNECT_TIMEOUT, GITHUB_API_TIMEOUT), **kwargs)
         except requests.RequestException:
             return None
+        
+        if response.headers.get('X-RateLimit-Remaining') == '0':
+            try:
+                self._rate_limit_reset = float(response.headers.get('X-RateLimit-Reset', 0))
+            except ValueError:
+                pass
+        return response
+    
+    def rate_limit_wait(self) -> float:
+        """Seconds until the GitHub quota resets, or 0 if requests may be made."""
+        wait = self._rate_limit_reset - time.time()
+        return wait if wait > 0 else 0
     
-    def get_latest_workflow_runs(self, limit: int = 5) -> List[WorkflowRun]:
-        """Get recent workflow runs for the specified workflow."""
-        response = self._make_github_request(
+    def _get_json(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                  transform: Optional[Callable] = None):
+        """
+        GET a JSON resource using ETag conditional requests.
+        
+        Unchanged resources come back as 304 Not Modified, which has no body
+        and does not count against the GitHub rate limit; the cached JSON
+        from the last 200 response is returned instead.
+        
+        Args:
+            endpoint: API path below the repository
+            params: Query parameters
+            transform: Optional function that trims the parsed body before
+                it is cached and returned
+        
+        Returns:
+            Tuple of (response, data); data is None if the request failed
+        """
+        key = (endpoint, tuple(sorted((params or {}).items())))
+        with self._etag_lock:
+            cached = self._etag_cache.get(key)
+            if cached:
+                self._etag_cache.move_to_end(key)
+        headers = {'If-None-Match': cached[0]} if cached else None
+        
+        response = self._make_github_request(endpoint, headers=headers, params=params)
+        if response is None:
+            return None, None
+        
+        if response.status_code == 304 and cached:
+            return response, cached[1]
+        
+        if response.status_code == 200:
+            data = orjson.loads(response.content) if orjson else response.json()
+            if transform:
+                data = transform(data)
+            etag = response.headers.get('ETag')
+            if etag:
+                with self._etag_lock:
+                    self._etag_cache[key] = (etag, data)
+                    self._etag_cache.move_to_end(key)
+                    while len(self._etag_cache) > ETAG_CACHE_MAX_ENTRIES:
+                        self._etag_cache.popitem(last=False)
+            return response, data
+        
+        return response, None
+    
+    def get_latest_workflow_runs(self, limit: int = 5,
+                                 created_after: Optional[datetime] = None) -> List[WorkflowRun]:
+        """
+        Get recent workflow runs for the specified workflow.
+        
+        Args:
+            limit: Maximum number of runs to return
+            created_after: Only return workflow_dispatch runs created at or
+                after this UTC time (filtered by GitHub)
+        """
+        params: Dict[str, Any] = {'per_page': limit}
+        if created_after is not None:
+            params['created'] = f">={created_after.strftime('%Y-%m-%dT%H:%M:%SZ')}"
+            params['event'] = 'workflow_dispatch'
+        
+        _, data = self._get_json(
             f'actions/workflows/{WORKFLOW_FILENAME}/runs',
-            params={'per_page': limit}
+            params=params,
+            transform=_slim_runs
         )
         
-        if not response or response.status_code != 200:
+        if data is None:
             return []
         
-        runs_data = response.json().get('workflow_runs', [])
+        runs_data = data.get('workflow_runs', [])
         return [
             WorkflowRun(
                 id=run['id'],
@@ -113,44 +272,199 @@ class GitHubActionsMonitor:
         ]
     
     def monitor_workflow(self, run_id: int, callback: Optional[Callable] = None) -> None:
-        """Monitor a specific workflow run in a separate thread."""
+        """
+        Monitor a specific workflow run.
+        
+        All monitored runs share one scheduler thread that sleeps until the
+        next run is due, instead of one polling thread per run.
+        """
         self.workflow_run_id = run_id
-        thread = threading.Thread(
-            target=self._monitor_workflow_thread,
-            args=(run_id, callback),
-            daemon=True
-        )
-        thread.start()
+        with self._scheduler_cond:
+            self._runs[run_id] = {
+                'callback': callback,
+                'failures': 0,
+                'unchanged': 0,
+                'pending': None,
+                'due': time.monotonic()
+            }
+            heapq.heappush(self._schedule, (self._runs[run_id]['due'], run_id))
+            
+            if self._scheduler_thread is None:
+                if self._start_background_task:
+                    self._scheduler_thread = self._start_background_task(self._scheduler_loop)
+                else:
+                    self._scheduler_thread = threading.Thread(
+                        target=self._scheduler_loop,
+                        daemon=True
+                    )
+                    self._scheduler_thread.start()
+            self._scheduler_cond.notify()
     
-    def _monitor_workflow_thread(self, run_id: int, callback: Optional[Callable]) -> None:
-        """Monitor workflow run in a separate thread."""
+    def _scheduler_loop(self) -> None:
+        """Poll each monitored run when it is due, on a single thread."""
         while True:
-            try:
-                response = self._make_github_request(f'actions/runs/{run_id}')
-                
-                if response and response.status_code == 200:
-                    run_data = response.json()
-                    status = run_data['status']
+            with self._scheduler_cond:
+                while True:
+                    if not self._schedule:
+                        self._scheduler_cond.wait()
+                        continue
                     
-                    if callback:
-                        callback(run_data)
+                    due, run_id = self._schedule[0]
+                    wait = due - time.monotonic()
+                    if wait > 0:
+                        self._scheduler_cond.wait(wait)
+                        continue
                     
-                    # Stop monitoring if workflow is complete
-                    if status == 'completed':
-                        self._check_artifacts(run_id, callback)
+                    heapq.heappop(self._schedule)
+                    state = self._runs.get(run_id)
+                    # Skip entries superseded by a reschedule (e.g. a webhook)
+                    if state is not None and state['due'] == due:
                         break
                 
-                time.sleep(WORKFLOW_MONITORING_DELAY)
-                
-            except Exception as e:
-                print(f"Error monitoring workflow: {e}")
-                break
+                run_data, state['pending'] = state['pending'], None
+            
+            delay = self._poll_run(run_id, state, run_data)
+            
+            with self._scheduler_cond:
+                if delay is None:
+                    if self._runs.get(run_id) is state:
+                        del self._runs[run_id]
+                    self._forget_run(run_id)
+                elif self._runs.get(run_id) is state:
+                    # A webhook that arrived during the poll is handled right away
+                    if state['pending'] is not None:
+                        delay = 0
+                    state['due'] = time.monotonic() + delay
+                    heapq.heappush(self._schedule, (state['due'], run_id))
+    
+    def _poll_run(self, run_id: int, state: Dict[str, Any],
+                  run_data: Optional[Dict[str, Any]]) -> Optional[float]:
+        """
+        Check one monitored run and notify its callback.
+        
+        Args:
+            run_id: Workflow run ID
+            state: Scheduler state for the run
+            run_data: Run payload delivered by a webhook, if any
+            
+        Returns:
+            Seconds until the next check, or None when monitoring is finished
+        """
+        callback = state['callback']
+        try:
+            response = None
+            changed = True
+            if run_data is None:
+                response, run_data = self._get_json(f'actions/runs/{run_id}', transform=_slim_run)
+                if run_data is not None:
+                    state['failures'] = 0
+                    # 304: the run has not changed since the last poll
+                    changed = response.status_code != 304
+            
+            if run_data is None:
+                # Back off exponentially while the API keeps failing
+                delay = min(WORKFLOW_MONITORING_DELAY * 2 ** state['failures'],
+                            WORKFLOW_MAX_BACKOFF)
+                state['failures'] += 1
+                return max(delay, self._rate_limit_delay(response))
+            
+            status = run_data['status']
+            
+            if callback and changed:
+                callback(run_data)
+            
+            # Stop monitoring if workflow is complete
+            if status == 'completed':
+                self._check_artifacts(run_id, callback)
+                return None
+            
+            # Queued runs change slowly; poll running ones more often
+            delay = WORKFLOW_QUEUED_DELAY if status == 'queued' else WORKFLOW_MONITORING_DELAY
+            
+            # Double the interval while the run stays unchanged; reset on any change
+            state['unchanged'] = 0 if changed else state['unchanged'] + 1
+            if state['unchanged']:
+                delay = min(delay * 2 ** state['unchanged'], WORKFLOW_UNCHANGED_MAX_DELAY)
+            if self.webhook_secret:
+                # Webhooks deliver updates; polling is only a safety net
+                delay = WEBHOOK_FALLBACK_DELAY
+            return max(delay, self._rate_limit_delay(response))
+            
+        except Exception as e:
+            print(f"Error monitoring workflow: {e}")
+            return None
+    
+    def _forget_run(self, run_id: int) -> None:
+        """Drop cached responses for a run once it is no longer monitored."""
+        prefix = f'actions/runs/{run_id}'
+        with self._etag_lock:
+            for key in [key for key in self._etag_cache
+                        if key[0] == prefix or key[0].startswith(prefix + '/')]:
+                del self._etag_cache[key]
+    
+    def stop(self) -> None:
+        """Stop monitoring all runs; the scheduler drops them without another poll."""
+        with self._scheduler_cond:
+            self._runs.clear()
+            self._schedule.clear()
+            self._scheduler_cond.notify()
+    
+    def verify_webhook_signature(self, body: bytes, signature: Optional[str]) -> bool:
+        """Check the X-Hub-Signature-256 header against GITHUB_WEBHOOK_SECRET."""
+        if not self.webhook_secret or not signature:
+            return False
+        
+        expected = 'sha256=' + hmac.new(
+            self.webhook_secret.encode('utf-8'), body, hashlib.sha256
+        ).hexdigest()
+        return hmac.compare_digest(expected, signature)
+    
+    def handle_webhook_event(self, event: str, payload: Dict[str, Any]) -> bool:
+        """
+        Route a workflow_run webhook payload to the scheduler for that run.
+        
+        Returns:
+            True if the event belonged to a monitored run
+        """
+        if event != 'workflow_run':
+            return False
+        
+        run_data = _slim_run(payload.get('workflow_run') or {})
+        with self._scheduler_cond:
+            state = self._runs.get(run_data.get('id'))
+            if state is None:
+                return False
+            
+            # Hand the payload to the scheduler and make the run due now
+            state['pending'] = run_data
+            state['due'] = time.monotonic()
+            heapq.heappush(self._schedule, (state['due'], run_data['id']))
+            self._scheduler_cond.notify()
+        return True
+    
+    @staticmethod
+    def _rate_limit_delay(response: Optional[requests.Response]) -> float:
+        """Seconds to wait until the rate limit resets, or 0 if quota remains."""
+        if response is None:
+            return 0
+        
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset = response.headers.get('X-RateLimit-Reset')
+        if remaining is None or reset is None:
+            return 0
+        
+        try:
+            if int(remaining) >= GITHUB_RATE_LIMIT_FLOOR:
+                return 0
+            return max(0.0, min(int(reset) - time.time(), 3600))
+        except ValueError:
+            return 0
     
     def _check_artifacts(self, run_id: int, callback: Optional[Callable]) -> None:
         """Check for workflow artifacts and notify callback."""
-        response = self._make_github_request(f'actions/runs/{run_id}/artifacts')
+        _, data = self._get_json(f'actions/runs/{run_id}/artifacts', transform=_slim_artifacts)
         
-        if response and response.status_code == 200:
-            artifacts = response.json().get('artifacts', [])
+        if data is not None:
+            artifacts = data.get('artifacts', [])
             if artifacts and callback:
                 callback({'artifacts': artifacts})